@@ -8,6 +8,7 @@ IDLE_THRESHOLD_MS: int = 600_000  # 10 minutes
 SWITCH_MIN_DURATION: int = 5  # seconds
 MAX_NO_EVENT_GAP: int = IDLE_THRESHOLD_MS // 1000  # 10 minutes
 ICON_PULSE_INTERVAL = 10000
+TRAY_UPDATE_INTERVAL = 5000  # ms; the tooltip shows whole minutes
 
 # User configuration file path
 USER_CONFIG_PATH: str = os.path.expanduser("~/.config/screentray/settings.json")
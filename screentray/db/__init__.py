@@ -1,5 +1,13 @@
 """Database layer."""
-from .connection import get_connection, get_cursor, ensure_db_exists
+from .connection import (
+    get_connection, get_read_connection, close_connection,
+    get_cursor, get_read_cursor, ensure_db_exists
+)
 from .event_repository import EventRepository
+from .daily_totals_repository import DailyTotalsRepository
 
-__all__ = ['get_connection', 'get_cursor', 'ensure_db_exists', 'EventRepository']
+__all__ = [
+    'get_connection', 'get_read_connection', 'close_connection',
+    'get_cursor', 'get_read_cursor', 'ensure_db_exists',
+    'EventRepository', 'DailyTotalsRepository'
+]
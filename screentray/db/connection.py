@@ -1,37 +1,116 @@
 """Database connection management."""
 import sqlite3
 import os
+import threading
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Iterator, Optional
 
 DB_PATH: str = os.path.expanduser("~/.local/share/screentracker.db")
 
+# One connection per thread, shared by repositories, services and web routes
+_local = threading.local()
 
-def get_connection() -> sqlite3.Connection:
-    """Create and return a database connection."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+# Bump whenever ensure_db_exists() gains DDL, so existing databases pick it up
+SCHEMA_VERSION = 1
+
+
+def _open(attr: str, query_only: bool) -> sqlite3.Connection:
+    """Return the thread's connection stored under attr, opening it if needed."""
+    conn: Optional[sqlite3.Connection] = getattr(_local, attr, None)
+    if conn is not None and getattr(_local, attr + "_path", None) == DB_PATH:
+        return conn
+
+    if conn is not None:
+        conn.close()
+
+    conn = sqlite3.connect(DB_PATH, timeout=5.0, cached_statements=256)
+    if not query_only:
+        # Named column access for web routes; the reader connection keeps
+        # plain tuples, the cheapest row type, since its callers index rows
+        conn.row_factory = sqlite3.Row
+    # Small per-connection tuning; journal mode is set once in ensure_db_exists().
+    # NORMAL sync is durable across application crashes in WAL mode and skips
+    # an fsync per commit.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-4000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # Read pages straight from a shared mapping rather than copying them
+    # through read() calls; only the mapped range is ever touched
+    conn.execute("PRAGMA mmap_size=268435456")
+    if query_only:
+        conn.execute("PRAGMA query_only=ON")
+    setattr(_local, attr, conn)
+    setattr(_local, attr + "_path", DB_PATH)
     return conn
 
 
+def get_connection() -> sqlite3.Connection:
+    """
+    Return the calling thread's database connection.
+
+    The connection is opened on first use and reused afterwards, so a
+    request or timer tick that goes through several services pays for
+    a single connect instead of one per query.
+    """
+    return _open("conn", query_only=False)
+
+
+def get_read_connection() -> sqlite3.Connection:
+    """
+    Return the calling thread's read-only connection.
+
+    Kept apart from the writer connection so lookups from the UI never
+    share a connection (or an open write transaction) with inserts.
+    With WAL, these reads run alongside the tracker's writes.
+    """
+    return _open("read_conn", query_only=True)
+
+
+def close_connection() -> None:
+    """Close the calling thread's connections, if any are open."""
+    for attr in ("conn", "read_conn"):
+        conn: Optional[sqlite3.Connection] = getattr(_local, attr, None)
+        if conn is not None:
+            conn.close()
+            setattr(_local, attr, None)
+
+
 @contextmanager
 def get_cursor() -> Iterator[sqlite3.Cursor]:
     """Context manager for database operations."""
     conn = get_connection()
+    cursor = conn.cursor()
     try:
-        cursor = conn.cursor()
         yield cursor
         conn.commit()
     except Exception:
         conn.rollback()
         raise
     finally:
-        conn.close()
+        cursor.close()
+
+
+@contextmanager
+def get_read_cursor() -> Iterator[sqlite3.Cursor]:
+    """Context manager for read-only queries on the reader connection."""
+    cursor = get_read_connection().cursor()
+    try:
+        yield cursor
+    finally:
+        cursor.close()
 
 
 def ensure_db_exists() -> None:
     """Ensure database directory and table exist."""
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    conn = get_connection()
+    # An up-to-date schema was stamped by an earlier run; skip the DDL
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+
+    # WAL lets the tray and web readers run alongside the tracker's writes.
+    # The mode is persistent, so setting it here covers every connection.
+    conn.execute("PRAGMA journal_mode=WAL")
     with get_cursor() as cur:
         cur.execute("""
             CREATE TABLE IF NOT EXISTS events (
@@ -46,7 +125,20 @@ def ensure_db_exists() -> None:
             CREATE INDEX IF NOT EXISTS idx_events_timestamp 
             ON events(timestamp)
         """)
+        # Covers "latest event of these types" lookups (type IN ... ORDER BY
+        # timestamp DESC LIMIT 1) without a sort; supersedes idx_events_type
         cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_events_type 
-            ON events(type)
+            CREATE INDEX IF NOT EXISTS idx_events_type_ts
+            ON events(type, timestamp)
+        """)
+        cur.execute("DROP INDEX IF EXISTS idx_events_type")
+        # Rollup of completed days, filled lazily by ActivityService
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS daily_totals (
+                date TEXT PRIMARY KEY,
+                active_seconds REAL NOT NULL,
+                inactive_seconds REAL NOT NULL,
+                short_idle_seconds REAL NOT NULL
+            )
         """)
+        cur.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
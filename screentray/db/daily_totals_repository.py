@@ -0,0 +1,57 @@
+"""Repository for the per-day activity rollup."""
+import datetime
+from typing import Dict, Iterable, Optional, Tuple
+from .connection import get_cursor, get_read_cursor
+
+
+class DailyTotalsRepository:
+    """
+    Stored active/inactive totals for completed days.
+
+    Only days that can no longer receive events are written here, so rows
+    never need invalidating; the current days are always computed live.
+    """
+
+    @staticmethod
+    def find_range(start: datetime.date, end: datetime.date) -> Dict[str, Tuple[float, float]]:
+        """Return {date: (active_seconds, inactive_seconds)} for stored days in range."""
+        with get_read_cursor() as cur:
+            cur.execute("""
+                SELECT date, active_seconds, inactive_seconds
+                FROM daily_totals
+                WHERE date >= ? AND date <= ?
+            """, (start.isoformat(), end.isoformat()))
+            return {r[0]: (r[1], r[2]) for r in cur.fetchall()}
+
+    @staticmethod
+    def find_day(day: datetime.date) -> Optional[Tuple[float, float, float]]:
+        """Return (active_seconds, inactive_seconds, short_idle_seconds) for a stored day, or None."""
+        with get_read_cursor() as cur:
+            cur.execute("""
+                SELECT active_seconds, inactive_seconds, short_idle_seconds
+                FROM daily_totals
+                WHERE date = ?
+            """, (day.isoformat(),))
+            row = cur.fetchone()
+            return (row[0], row[1], row[2]) if row else None
+
+    @staticmethod
+    def save_day(day: datetime.date, active_sec: float, inactive_sec: float,
+                 short_idle_sec: float) -> None:
+        """Store a day's totals along with its short inactive time."""
+        with get_cursor() as cur:
+            cur.execute("""
+                INSERT OR REPLACE INTO daily_totals
+                    (date, active_seconds, inactive_seconds, short_idle_seconds)
+                VALUES (?, ?, ?, ?)
+            """, (day.isoformat(), active_sec, inactive_sec, short_idle_sec))
+
+    @staticmethod
+    def save_many(rows: Iterable[Tuple[str, float, float, float]]) -> None:
+        """Store (date, active_seconds, inactive_seconds, short_idle_seconds) rows in one transaction."""
+        with get_cursor() as cur:
+            cur.executemany("""
+                INSERT OR REPLACE INTO daily_totals
+                    (date, active_seconds, inactive_seconds, short_idle_seconds)
+                VALUES (?, ?, ?, ?)
+            """, rows)
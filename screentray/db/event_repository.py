@@ -1,8 +1,85 @@
 """Repository for event data access."""
 import datetime
+import queue
+import sqlite3
+import threading
+from time import monotonic
 from typing import List, Optional, Tuple
 from ..models import Event
-from .connection import get_cursor
+from .connection import get_cursor, get_read_cursor
+
+# Fixed SQL text so the connection's statement cache can reuse the prepared form
+INSERT_EVENT_SQL = "INSERT INTO events (timestamp, type, detail) VALUES (?, ?, ?)"
+LATEST_ID_SQL = "SELECT MAX(id) FROM events"
+LATEST_TIMESTAMP_SQL = "SELECT timestamp FROM events ORDER BY id DESC LIMIT 1"
+
+# Buffered writes: one transaction per batch instead of one per event
+WRITE_FLUSH_INTERVAL = 2.0  # seconds a batch may wait before it is committed
+WRITE_BATCH_SIZE = 32
+MAX_PENDING_WRITES = 1000  # failed rows kept for retry; the oldest are dropped beyond this
+
+# None is a flush marker: commit what has been collected right away
+_write_queue: "queue.Queue[Optional[Tuple[str, str, str]]]" = queue.Queue()
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+# Rows from batches that failed to commit, waiting for a retry
+_pending: List[Tuple[str, str, str]] = []
+_pending_lock = threading.Lock()
+
+
+def _write_batch(batch: List[Tuple[str, str, str]]) -> bool:
+    """Commit a batch of queued rows, keeping it in _pending if that fails."""
+    global _pending
+    try:
+        with get_cursor() as cur:
+            cur.executemany(INSERT_EVENT_SQL, batch)
+        return True
+    except sqlite3.Error as e:
+        print(f"Failed to write {len(batch)} queued events, will retry: {e}")
+        if len(batch) > MAX_PENDING_WRITES:
+            print(f"Dropping {len(batch) - MAX_PENDING_WRITES} oldest queued events")
+        _pending = batch[-MAX_PENDING_WRITES:]
+        return False
+
+
+def _drain_writes() -> None:
+    """
+    Writer thread: commit queued events in batches.
+
+    A batch that fails to commit (e.g. the database stayed locked) is kept
+    and retried with the next one, or on its own after WRITE_FLUSH_INTERVAL
+    if nothing else arrives, rather than dropped.
+    """
+    global _pending
+    while True:
+        try:
+            item = _write_queue.get(timeout=WRITE_FLUSH_INTERVAL if _pending else None)
+            taken = 1
+        except queue.Empty:
+            item, taken = None, 0
+        batch = [item] if item is not None else []
+        deadline = monotonic() + WRITE_FLUSH_INTERVAL
+        while item is not None and len(batch) < WRITE_BATCH_SIZE:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = _write_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            taken += 1
+            if item is not None:
+                batch.append(item)
+        try:
+            with _pending_lock:
+                batch = _pending + batch
+                _pending = []
+                if batch:
+                    _write_batch(batch)
+        finally:
+            for _ in range(taken):
+                _write_queue.task_done()
 
 
 class EventRepository:
@@ -20,15 +97,67 @@ class EventRepository:
         ts_str = timestamp.isoformat(timespec="seconds")
 
         with get_cursor() as cur:
-            cur.execute(
-                "INSERT INTO events (timestamp, type, detail) VALUES (?, ?, ?)",
-                (ts_str, type_, detail)
-            )
+            cur.execute(INSERT_EVENT_SQL, (ts_str, type_, detail))
+
+    @staticmethod
+    def insert_async(type_: str, detail: str = "", timestamp: Optional[datetime.datetime] = None) -> None:
+        """
+        Queue an event for the background writer.
+
+        The timestamp is taken now; the row is committed with other queued
+        events within WRITE_FLUSH_INTERVAL seconds. Call flush() to wait.
+        """
+        global _writer
+        if timestamp is None:
+            timestamp = datetime.datetime.now()
+        _write_queue.put((timestamp.isoformat(timespec="seconds"), type_, detail))
+
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_drain_writes, name="event-writer", daemon=True)
+                _writer.start()
+
+    @staticmethod
+    def flush() -> None:
+        """
+        Block until every queued event has been written.
+
+        Rows still failing after one more synchronous attempt are dropped
+        and logged, so nothing is left behind unreported at shutdown.
+        """
+        global _pending
+        if _writer is None:
+            return
+        _write_queue.put(None)
+        _write_queue.join()
+
+        with _pending_lock:
+            batch, _pending = _pending, []
+            if batch and not _write_batch(batch):
+                for row in _pending:
+                    print(f"Dropped queued event: {row}")
+                _pending = []
+
+    @staticmethod
+    def get_latest_id() -> int:
+        """Return the id of the newest event, or 0 if there are none."""
+        with get_read_cursor() as cur:
+            cur.execute(LATEST_ID_SQL)
+            row = cur.fetchone()
+            return row[0] or 0
+
+    @staticmethod
+    def get_latest_timestamp() -> Optional[str]:
+        """Return the stored timestamp of the newest event, or None if there are none."""
+        with get_read_cursor() as cur:
+            cur.execute(LATEST_TIMESTAMP_SQL)
+            row = cur.fetchone()
+            return row[0] if row else None
 
     @staticmethod
     def find_last_by_types(types: Tuple[str, ...], before: Optional[datetime.datetime] = None) -> Optional[Event]:
         """Find the most recent event of given types."""
-        with get_cursor() as cur:
+        with get_read_cursor() as cur:
             if before:
                 cur.execute("""
                     SELECT id, timestamp, type, detail
@@ -65,7 +194,7 @@ class EventRepository:
     @staticmethod
     def find_last_inactive_after(after: datetime.datetime) -> Optional[Event]:
         """Find the most recent inactive event after a given time."""
-        with get_cursor() as cur:
+        with get_read_cursor() as cur:
             cur.execute("""
                 SELECT id, timestamp, type, detail
                 FROM events
@@ -81,11 +210,34 @@ class EventRepository:
                 return Event(id=row[0], timestamp=row[1], type=row[2], detail=row[3])
             return None
 
+    @staticmethod
+    def find_rows_since(start: datetime.datetime, end: datetime.datetime, after_id: int,
+                        types: Tuple[str, ...]) -> List[Tuple[int, str, str]]:
+        """
+        (id, timestamp, type) rows of given types in a period whose id is
+        greater than after_id.
+
+        Returned as the reader connection's plain tuples: the callers fold
+        thousands of these into state changes and never need an Event.
+        """
+        with get_read_cursor() as cur:
+            cur.execute("""
+                SELECT id, timestamp, type
+                FROM events
+                WHERE timestamp >= ? AND timestamp <= ?
+                  AND id > ?
+                  AND type IN ({})
+                ORDER BY timestamp ASC, id ASC
+            """.format(','.join('?' * len(types))),
+            (start.isoformat(), end.isoformat(), after_id) + types)
+
+            return cur.fetchall()
+
     @staticmethod
     def find_events_in_period(start: datetime.datetime, end: datetime.datetime,
                               types: Optional[Tuple[str, ...]] = None) -> List[Event]:
         """Find all events in a time period, optionally filtered by type."""
-        with get_cursor() as cur:
+        with get_read_cursor() as cur:
             if types:
                 cur.execute("""
                     SELECT id, timestamp, type, detail
@@ -109,7 +261,7 @@ class EventRepository:
     @staticmethod
     def find_last_inactive_to_active_transition() -> Optional[Tuple[Event, Event]]:
         """Find the most recent inactive->active transition pair."""
-        with get_cursor() as cur:
+        with get_read_cursor() as cur:
             cur.execute("""
                 WITH inactive_starts AS (
                     SELECT id, timestamp, type
@@ -138,4 +290,4 @@ class EventRepository:
                 inactive = Event(id=row[0], timestamp=row[1], type=row[2], detail="")
                 active = Event(id=row[3], timestamp=row[4], type=row[5], detail="")
                 return (inactive, active)
-            return None
\ No newline at end of file
+            return None
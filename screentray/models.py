@@ -1,7 +1,13 @@
 """
 Data models for the application.
 """
+import datetime
 from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional
+
+# Poll details start with the recorded state ("state=active idle=5s ...")
+_POLL_STATES = {"state=active": "active", "state=inactive": "inactive"}
 
 @dataclass
 class Event:
@@ -10,3 +16,15 @@ class Event:
     timestamp: str
     type: str
     detail: str = ""
+
+    @cached_property
+    def ts(self) -> datetime.datetime:
+        """The timestamp parsed to a datetime, computed on first access."""
+        return datetime.datetime.fromisoformat(self.timestamp)
+
+    @cached_property
+    def poll_state(self) -> Optional[str]:
+        """State recorded in a poll event's detail, or None for other events."""
+        if self.type != "poll" or not self.detail:
+            return None
+        return _POLL_STATES.get(self.detail.split(" ", 1)[0])
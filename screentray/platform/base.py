@@ -1,7 +1,11 @@
 """Base platform abstraction."""
+import shutil
 import subprocess
+import threading
+import time
 from abc import ABC, abstractmethod
 from typing import Optional, Tuple, Dict, List
+from .x11 import get_x11
 
 
 class PlatformBase(ABC):
@@ -15,6 +19,9 @@ class PlatformBase(ABC):
     SCREEN_OFF_COMMAND: Optional[List[str]] = None
     LOCK_COMMAND: Optional[List[str]] = None
 
+    # Screen state seen by the last _probe_idle_and_screen() call
+    _screen_was_on: bool = True
+
     @abstractmethod
     def get_idle_seconds(self) -> float:
         """Return current idle time in seconds."""
@@ -30,6 +37,27 @@ class PlatformBase(ABC):
         """Get active window info for app tracking."""
         pass
 
+    def get_idle_and_screen_state(self) -> Tuple[float, bool]:
+        """
+        Return (idle seconds, screen on); subclasses may probe both at once.
+
+        Idle time is irrelevant while the screen is off (the state is
+        inactive either way), so it is reported as 0 without probing.
+        """
+        screen_on = self.is_screen_on()
+        return (self.get_idle_seconds() if screen_on else 0.0), screen_on
+
+    def wait_for_activity(self, timeout: float) -> None:
+        """
+        Block until the next poll is due.
+
+        On X11 this wakes early when the server reports a screensaver
+        change (blank/unblank), so screen state changes are seen at once.
+        """
+        x11 = get_x11()
+        if x11 is None or x11.wait_for_event(timeout) is None:
+            time.sleep(timeout)
+
     def suspend(self) -> bool:
         """Suspend system."""
         return self._run_command(self.SUSPEND_COMMAND)
@@ -60,26 +88,128 @@ class PlatformBase(ABC):
 
     # Shared helpers
     def _check_command(self, cmd: str) -> bool:
-        """Check if command exists."""
-        try:
-            subprocess.run(["which", cmd], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        """Check if command exists (a PATH lookup, no `which` process)."""
+        return shutil.which(cmd) is not None
 
     def _run_command(self, cmd: List[str], check: bool = False) -> bool:
         """
-        Execute command, return success.
+        Start command, return success.
         Does NOT actually run if check=True (for capability testing).
+
+        The command is not waited for: these are called from the tray's
+        event loop, and systemctl suspend in particular only returns after
+        resume. Success means the command was started; a daemon thread
+        waits on it so the exited process is reaped.
         """
         if check:
             # Only verify first command exists
             return self._check_command(cmd[0])
         try:
-            subprocess.run(cmd, check=False, capture_output=True)
-            return True
+            proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         except FileNotFoundError:
             return False
+        threading.Thread(target=proc.wait, name=f"reap-{cmd[0]}", daemon=True).start()
+        return True
+
+    def _run_concurrently(self, commands: List[List[str]]) -> List[Optional[bytes]]:
+        """Start all commands before waiting on any; stdout per command, or None on failure."""
+        procs: List[Optional[subprocess.Popen[bytes]]] = []
+        for cmd in commands:
+            try:
+                procs.append(subprocess.Popen(
+                    cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+                ))
+            except FileNotFoundError:
+                procs.append(None)
+
+        outputs: List[Optional[bytes]] = []
+        for proc in procs:
+            if proc is None:
+                outputs.append(None)
+                continue
+            out, _ = proc.communicate()
+            outputs.append(out if proc.returncode == 0 else None)
+        return outputs
+
+    def _probe_idle_and_screen(self) -> Tuple[float, bool]:
+        """
+        Idle time and screen state from X, or from xprintidle and xset.
+
+        When both commands are needed they run side by side, so a tick
+        waits for one process start-up instead of two. While the screen is
+        off only xset runs; idle time is reported as 0.
+        """
+        screen_on = self._x11_screen_on()
+        if screen_on is None and not self._screen_was_on:
+            # Off last time: check the screen first and skip xprintidle
+            # for as long as it stays off
+            screen_on = self._parse_screen_state(
+                self._run_concurrently([self.SCREEN_STATE_COMMAND])[0]
+            )
+        if screen_on is False:
+            self._screen_was_on = False
+            return 0.0, False
+
+        idle = self._x11_idle_seconds()
+        if idle is None and screen_on is None:
+            idle_out, screen_out = self._run_concurrently(
+                [self.IDLE_COMMANDS[0], self.SCREEN_STATE_COMMAND]
+            )
+            idle = self._parse_idle_ms(idle_out)
+            screen_on = self._parse_screen_state(screen_out)
+        elif idle is None:
+            idle = self._parse_idle_ms(self._run_concurrently([self.IDLE_COMMANDS[0]])[0])
+        elif screen_on is None:
+            screen_on = self._parse_screen_state(
+                self._run_concurrently([self.SCREEN_STATE_COMMAND])[0]
+            )
+
+        self._screen_was_on = screen_on
+        return (idle if screen_on else 0.0), screen_on
+
+    @staticmethod
+    def _parse_idle_ms(out: Optional[bytes]) -> float:
+        """Seconds from xprintidle's millisecond output, 0 if unavailable."""
+        try:
+            return int(out.strip()) / 1000.0 if out else 0.0
+        except ValueError:
+            return 0.0
+
+    @staticmethod
+    def _parse_screen_state(out: Optional[bytes]) -> bool:
+        """Monitor state from 'xset -q' output; assume on if unavailable."""
+        return "Monitor is On" in out.decode() if out else True
+
+    def _xdotool_window_info(self) -> Optional[Tuple[str, str]]:
+        """Active window (class, title) from a single chained xdotool call."""
+        if not self.WINDOW_COMMANDS:
+            return None
+        try:
+            lines = subprocess.check_output(
+                self.WINDOW_COMMANDS["get_info"],
+                stderr=subprocess.DEVNULL
+            ).decode().splitlines()
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return None
+        if len(lines) < 2:
+            return None
+        # getactivewindow may echo the window id first; class and title are last
+        return (lines[-2].strip(), lines[-1].strip())
+
+    def _x11_idle_seconds(self) -> Optional[float]:
+        """Idle time straight from the X server, or None if unavailable."""
+        x11 = get_x11()
+        return x11.idle_seconds() if x11 else None
+
+    def _x11_screen_on(self) -> Optional[bool]:
+        """DPMS monitor state straight from the X server, or None if unavailable."""
+        x11 = get_x11()
+        return x11.screen_on() if x11 else None
+
+    def _x11_window_info(self) -> Optional[Tuple[str, str]]:
+        """Active window (class, title) straight from the X server, or None."""
+        x11 = get_x11()
+        return x11.active_window_info() if x11 else None
 
     def _is_x11(self) -> bool:
         """Check if running on X11."""
@@ -2,6 +2,7 @@
 import subprocess
 from typing import Optional, Tuple
 from .base import PlatformBase
+from .x11 import get_x11
 
 
 class GenericPlatform(PlatformBase):
@@ -10,9 +11,12 @@ class GenericPlatform(PlatformBase):
     IDLE_COMMANDS = [["xprintidle"]]
     SCREEN_STATE_COMMAND = ["xset", "-q"]
     WINDOW_COMMANDS = {
-        "get_id": ["xdotool", "getactivewindow"],
-        "get_class": ["xdotool", "getwindowclassname"],
-        "get_title": ["xdotool", "getwindowname"]
+        # One xdotool process; %1 reuses the window found by getactivewindow
+        "get_info": [
+            "xdotool", "getactivewindow",
+            "getwindowclassname", "%1",
+            "getwindowname", "%1"
+        ]
     }
     SCREEN_OFF_COMMAND = ["xset", "dpms", "force", "off"]
     LOCK_COMMAND = ["loginctl", "lock-session"]
@@ -23,10 +27,13 @@ class GenericPlatform(PlatformBase):
 
     @property
     def supports_window_tracking(self) -> bool:
-        return self._is_x11() and self._check_command("xdotool")
+        return self._is_x11() and (get_x11() is not None or self._check_command("xdotool"))
 
     def get_idle_seconds(self) -> float:
-        """Try xprintidle, fallback to 0."""
+        """Try XScreenSaver, then xprintidle, fallback to 0."""
+        idle = self._x11_idle_seconds()
+        if idle is not None:
+            return idle
         try:
             idle_ms = int(subprocess.check_output(self.IDLE_COMMANDS[0]).strip())
             return idle_ms / 1000.0
@@ -34,34 +41,27 @@ class GenericPlatform(PlatformBase):
             return 0.0
 
     def is_screen_on(self) -> bool:
-        """Try xset, assume on if unavailable."""
+        """Try DPMS, then xset, assume on if unavailable."""
+        screen_on = self._x11_screen_on()
+        if screen_on is not None:
+            return screen_on
         try:
             out = subprocess.check_output(self.SCREEN_STATE_COMMAND).decode()
             return "Monitor is On" in out
         except (FileNotFoundError, subprocess.CalledProcessError):
             return True
 
+    def get_idle_and_screen_state(self) -> Tuple[float, bool]:
+        """Query X directly, or run xprintidle and xset concurrently."""
+        return self._probe_idle_and_screen()
+
     def get_active_window_info(self) -> Optional[Tuple[str, str]]:
         """Only works with xdotool on X11."""
         if not self._is_x11() or not self.WINDOW_COMMANDS:
             return None
 
-        try:
-            window_id = subprocess.check_output(
-                self.WINDOW_COMMANDS["get_id"],
-                stderr=subprocess.DEVNULL
-            ).decode().strip()
-
-            app_name = subprocess.check_output(
-                self.WINDOW_COMMANDS["get_class"] + [window_id],
-                stderr=subprocess.DEVNULL
-            ).decode().strip()
+        info = self._x11_window_info()
+        if info is not None:
+            return info
 
-            window_title = subprocess.check_output(
-                self.WINDOW_COMMANDS["get_title"] + [window_id],
-                stderr=subprocess.DEVNULL
-            ).decode().strip()
-
-            return (app_name, window_title)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return None
+        return self._xdotool_window_info()
@@ -2,6 +2,7 @@
 import subprocess
 from typing import Optional, Tuple
 from .base import PlatformBase
+from .x11 import get_x11
 
 
 class GNOMEPlatform(PlatformBase):
@@ -16,9 +17,12 @@ class GNOMEPlatform(PlatformBase):
     ]
     SCREEN_STATE_COMMAND = ["xset", "-q"]  # X11 only
     WINDOW_COMMANDS = {  # X11 only
-        "get_id": ["xdotool", "getactivewindow"],
-        "get_class": ["xdotool", "getwindowclassname"],
-        "get_title": ["xdotool", "getwindowname"]
+        # One xdotool process; %1 reuses the window found by getactivewindow
+        "get_info": [
+            "xdotool", "getactivewindow",
+            "getwindowclassname", "%1",
+            "getwindowname", "%1"
+        ]
     }
     SCREEN_OFF_COMMAND = ["xset", "dpms", "force", "off"]  # X11 only
     LOCK_COMMAND = ["gnome-screensaver-command", "-l"]
@@ -30,16 +34,22 @@ class GNOMEPlatform(PlatformBase):
     @property
     def supports_window_tracking(self) -> bool:
         # GNOME on Wayland doesn't expose window info by default
-        return self._is_x11() and self._check_command("xdotool")
+        return self._is_x11() and (get_x11() is not None or self._check_command("xdotool"))
 
     def get_idle_seconds(self) -> float:
         """
         Try multiple methods:
-        1. xprintidle on X11
-        2. gdbus query to Mutter (Wayland)
-        3. Fallback to 0
+        1. XScreenSaver query on X11
+        2. xprintidle on X11
+        3. gdbus query to Mutter (Wayland)
+        4. Fallback to 0
         """
-        # Try xprintidle first (X11)
+        if self._is_x11():
+            idle = self._x11_idle_seconds()
+            if idle is not None:
+                return idle
+
+        # Try xprintidle (X11)
         try:
             idle_ms = int(subprocess.check_output(self.IDLE_COMMANDS[0]).strip())
             return idle_ms / 1000.0
@@ -63,6 +73,10 @@ class GNOMEPlatform(PlatformBase):
         if not self._is_x11():
             return True
 
+        screen_on = self._x11_screen_on()
+        if screen_on is not None:
+            return screen_on
+
         try:
             out = subprocess.check_output(self.SCREEN_STATE_COMMAND).decode()
             return "Monitor is On" in out
@@ -74,32 +88,15 @@ class GNOMEPlatform(PlatformBase):
         if not self._is_x11() or not self.WINDOW_COMMANDS:
             return None
 
-        try:
-            window_id = subprocess.check_output(
-                self.WINDOW_COMMANDS["get_id"],
-                stderr=subprocess.DEVNULL
-            ).decode().strip()
-
-            app_name = subprocess.check_output(
-                self.WINDOW_COMMANDS["get_class"] + [window_id],
-                stderr=subprocess.DEVNULL
-            ).decode().strip()
-
-            window_title = subprocess.check_output(
-                self.WINDOW_COMMANDS["get_title"] + [window_id],
-                stderr=subprocess.DEVNULL
-            ).decode().strip()
-
-            return (app_name, window_title)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return None
+        info = self._x11_window_info()
+        if info is not None:
+            return info
+
+        return self._xdotool_window_info()
 
     def lock_screen(self) -> bool:
         """Try gnome-screensaver-command or loginctl."""
         if self._check_command("gnome-screensaver-command"):
-            try:
-                subprocess.run(["gnome-screensaver-command", "-l"], check=False)
+            if self._run_command(["gnome-screensaver-command", "-l"]):
                 return True
-            except FileNotFoundError:
-                pass
         return super().lock_screen()  # Try loginctl fallback
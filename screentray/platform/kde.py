@@ -2,6 +2,7 @@
 import subprocess
 from typing import Optional, Tuple
 from .base import PlatformBase
+from .x11 import get_x11
 
 
 class KDEPlatform(PlatformBase):
@@ -10,9 +11,12 @@ class KDEPlatform(PlatformBase):
     IDLE_COMMANDS = [["xprintidle"]]
     SCREEN_STATE_COMMAND = ["xset", "-q"]
     WINDOW_COMMANDS = {
-        "get_id": ["xdotool", "getactivewindow"],
-        "get_class": ["xdotool", "getwindowclassname"],
-        "get_title": ["xdotool", "getwindowname"]
+        # One xdotool process; %1 reuses the window found by getactivewindow
+        "get_info": [
+            "xdotool", "getactivewindow",
+            "getwindowclassname", "%1",
+            "getwindowname", "%1"
+        ]
     }
     SCREEN_OFF_COMMAND = ["xset", "dpms", "force", "off"]
     LOCK_COMMAND = ["loginctl", "lock-session"]
@@ -23,10 +27,13 @@ class KDEPlatform(PlatformBase):
 
     @property
     def supports_window_tracking(self) -> bool:
-        return self._check_command("xdotool")
+        return get_x11() is not None or self._check_command("xdotool")
 
     def get_idle_seconds(self) -> float:
-        """Use xprintidle (X11)."""
+        """Query XScreenSaver directly, falling back to xprintidle (X11)."""
+        idle = self._x11_idle_seconds()
+        if idle is not None:
+            return idle
         try:
             idle_ms = int(subprocess.check_output(self.IDLE_COMMANDS[0]).strip())
             return idle_ms / 1000.0
@@ -34,33 +41,27 @@ class KDEPlatform(PlatformBase):
             return 0.0
 
     def is_screen_on(self) -> bool:
-        """Use xset for DPMS state."""
+        """Query DPMS directly, falling back to xset."""
+        screen_on = self._x11_screen_on()
+        if screen_on is not None:
+            return screen_on
         try:
             out: bytes = subprocess.check_output(self.SCREEN_STATE_COMMAND)
             return "Monitor is On" in out.decode()
         except (FileNotFoundError, subprocess.CalledProcessError):
             return True
 
+    def get_idle_and_screen_state(self) -> Tuple[float, bool]:
+        """Query X directly, or run xprintidle and xset concurrently."""
+        return self._probe_idle_and_screen()
+
     def get_active_window_info(self) -> Optional[Tuple[str, str]]:
-        """Use xdotool for window info."""
+        """Read the active window from X directly, falling back to xdotool."""
         if not self.WINDOW_COMMANDS:
             return None
-        try:
-            window_id = subprocess.check_output(
-                self.WINDOW_COMMANDS["get_id"],
-                stderr=subprocess.DEVNULL
-            ).decode().strip()
 
-            app_name = subprocess.check_output(
-                self.WINDOW_COMMANDS["get_class"] + [window_id],
-                stderr=subprocess.DEVNULL
-            ).decode().strip()
+        info = self._x11_window_info()
+        if info is not None:
+            return info
 
-            window_title = subprocess.check_output(
-                self.WINDOW_COMMANDS["get_title"] + [window_id],
-                stderr=subprocess.DEVNULL
-            ).decode().strip()
-
-            return (app_name, window_title)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return None
+        return self._xdotool_window_info()
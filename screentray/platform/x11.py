@@ -0,0 +1,318 @@
+"""
+Direct Xlib access via ctypes.
+
+Polling helpers like xprintidle cost a fork, exec and X connection per
+call. This module keeps one Display connection open for the process and
+queries the X server directly. Everything degrades gracefully: if the
+libraries or a display are unavailable, get_x11() returns None and the
+platforms fall back to their subprocess commands.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+from time import monotonic
+from typing import Callable, Optional, Tuple
+
+# DPMS power levels from <X11/extensions/dpmsconst.h>
+DPMS_MODE_ON = 0
+
+# Event mask from <X11/extensions/saver.h>
+SCREEN_SAVER_NOTIFY_MASK = 0x1
+
+# XEvent is a union padded to 24 longs
+XEvent = ctypes.c_long * 24
+
+# XErrorHandler: int (*)(Display *, XErrorEvent *)
+XErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+
+@XErrorHandler
+def _ignore_x_errors(display: int, event: int) -> int:
+    """
+    Swallow X protocol errors.
+
+    The default handler exits the process, and a BadWindow is routine
+    here: the active window can close between two requests.
+    """
+    return 0
+
+
+# XIOErrorHandler: int (*)(Display *)
+XIOErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p)
+
+_io_error_callback: Optional[Callable[[], None]] = None
+
+
+def on_io_error(callback: Optional[Callable[[], None]]) -> None:
+    """Set the callback to run if the X connection is lost (None clears it)."""
+    global _io_error_callback
+    _io_error_callback = callback
+
+
+@XIOErrorHandler
+def _run_io_error_callback(display: int) -> int:
+    """
+    Run the registered callback before Xlib terminates the process.
+
+    Xlib calls exit() once this returns (the session ended or the server
+    died), skipping Python's own shutdown, so this is the last chance to
+    write anything out.
+    """
+    if _io_error_callback is not None:
+        try:
+            _io_error_callback()
+        except Exception as e:
+            print(f"X connection lost, shutdown callback failed: {e}")
+    return 0
+
+
+class XClassHint(ctypes.Structure):
+    """Mirror of XClassHint from <X11/Xutil.h>."""
+
+    _fields_ = [
+        ("res_name", ctypes.c_void_p),
+        ("res_class", ctypes.c_void_p),
+    ]
+
+
+class XScreenSaverInfo(ctypes.Structure):
+    """Mirror of the XScreenSaverInfo struct from <X11/extensions/scrnsaver.h>."""
+
+    _fields_ = [
+        ("window", ctypes.c_ulong),
+        ("state", ctypes.c_int),
+        ("kind", ctypes.c_int),
+        ("til_or_since", ctypes.c_ulong),
+        ("idle", ctypes.c_ulong),
+        ("eventMask", ctypes.c_ulong),
+    ]
+
+
+def _load_library(name: str, soname: str) -> Optional[ctypes.CDLL]:
+    """Load a shared library by soname, falling back to a lookup by name."""
+    for candidate in (soname, ctypes.util.find_library(name)):
+        if not candidate:
+            continue
+        try:
+            return ctypes.CDLL(candidate)
+        except OSError:
+            continue
+    return None
+
+
+class X11Display:
+    """A persistent connection to the X server with typed entry points."""
+
+    def __init__(self, xlib: ctypes.CDLL, xss: Optional[ctypes.CDLL],
+                 xext: Optional[ctypes.CDLL] = None) -> None:
+        self._xlib = xlib
+        self._xss = xss
+        self._xext = xext
+
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+
+        self.display = xlib.XOpenDisplay(None)
+        if not self.display:
+            raise OSError("Cannot open X display")
+        self.root = xlib.XDefaultRootWindow(self.display)
+
+        xlib.XConnectionNumber.argtypes = [ctypes.c_void_p]
+        xlib.XConnectionNumber.restype = ctypes.c_int
+        xlib.XPending.argtypes = [ctypes.c_void_p]
+        xlib.XPending.restype = ctypes.c_int
+        xlib.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.POINTER(XEvent)]
+        xlib.XNextEvent.restype = ctypes.c_int
+        xlib.XFlush.argtypes = [ctypes.c_void_p]
+        xlib.XFlush.restype = ctypes.c_int
+        self._fd = xlib.XConnectionNumber(self.display)
+        self._event = XEvent()
+        self._notify_selected = False
+
+        xlib.XSetErrorHandler.argtypes = [XErrorHandler]
+        xlib.XSetErrorHandler.restype = ctypes.c_void_p
+        xlib.XSetErrorHandler(_ignore_x_errors)
+        xlib.XSetIOErrorHandler.argtypes = [XIOErrorHandler]
+        xlib.XSetIOErrorHandler.restype = ctypes.c_void_p
+        xlib.XSetIOErrorHandler(_run_io_error_callback)
+        xlib.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+        xlib.XInternAtom.restype = ctypes.c_ulong
+        xlib.XGetWindowProperty.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_long, ctypes.c_long,
+            ctypes.c_int, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_void_p)
+        ]
+        xlib.XGetWindowProperty.restype = ctypes.c_int
+        xlib.XGetClassHint.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XClassHint)]
+        xlib.XGetClassHint.restype = ctypes.c_int
+        xlib.XFree.argtypes = [ctypes.c_void_p]
+        xlib.XFree.restype = ctypes.c_int
+        self._atom_active_window = xlib.XInternAtom(self.display, b"_NET_ACTIVE_WINDOW", 0)
+        self._atom_wm_name = xlib.XInternAtom(self.display, b"_NET_WM_NAME", 0)
+        self._atom_legacy_name = xlib.XInternAtom(self.display, b"WM_NAME", 0)
+
+        self._ss_info: Optional["ctypes._Pointer[XScreenSaverInfo]"] = None
+        if xss is not None:
+            xss.XScreenSaverAllocInfo.argtypes = []
+            xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(XScreenSaverInfo)
+            xss.XScreenSaverQueryInfo.argtypes = [
+                ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XScreenSaverInfo)
+            ]
+            xss.XScreenSaverQueryInfo.restype = ctypes.c_int
+            self._ss_info = xss.XScreenSaverAllocInfo()
+
+        self._dpms = False
+        if xext is not None:
+            xext.DPMSCapable.argtypes = [ctypes.c_void_p]
+            xext.DPMSCapable.restype = ctypes.c_int
+            xext.DPMSInfo.argtypes = [
+                ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort), ctypes.POINTER(ctypes.c_ubyte)
+            ]
+            xext.DPMSInfo.restype = ctypes.c_int
+            self._dpms = bool(xext.DPMSCapable(self.display))
+            self._power_level = ctypes.c_ushort()
+            self._dpms_state = ctypes.c_ubyte()
+
+    def idle_seconds(self) -> Optional[float]:
+        """Return user idle time from the XScreenSaver extension, if available."""
+        if self._xss is None or not self._ss_info:
+            return None
+        if not self._xss.XScreenSaverQueryInfo(self.display, self.root, self._ss_info):
+            return None
+        return self._ss_info.contents.idle / 1000.0
+
+    def wait_for_event(self, timeout: float) -> Optional[bool]:
+        """
+        Block until a screensaver notification arrives or timeout elapses.
+
+        Returns True if woken by an event, False on timeout, and None if
+        the XScreenSaver extension is unavailable (caller should sleep).
+        """
+        if self._xss is None:
+            return None
+
+        if not self._notify_selected:
+            self._xss.XScreenSaverSelectInput.argtypes = [
+                ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong
+            ]
+            self._xss.XScreenSaverSelectInput.restype = None
+            self._xss.XScreenSaverSelectInput(self.display, self.root, SCREEN_SAVER_NOTIFY_MASK)
+            self._xlib.XFlush(self.display)
+            self._notify_selected = True
+
+        woken = bool(self._xlib.XPending(self.display))
+        deadline = monotonic() + timeout
+        while not woken:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                break
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                break
+            # XPending reads the socket, so readable-but-empty (e.g. a
+            # reply to another request) is not a wakeup; keep waiting
+            woken = bool(self._xlib.XPending(self.display))
+
+        while self._xlib.XPending(self.display):
+            self._xlib.XNextEvent(self.display, ctypes.byref(self._event))
+        return woken
+
+    def _get_property(self, window: int, atom: int, length: int) -> Optional[Tuple[int, bytes]]:
+        """Read a window property as (format, raw bytes), or None if unset."""
+        actual_type = ctypes.c_ulong()
+        actual_format = ctypes.c_int()
+        nitems = ctypes.c_ulong()
+        bytes_after = ctypes.c_ulong()
+        data = ctypes.c_void_p()
+
+        status = self._xlib.XGetWindowProperty(
+            self.display, window, atom, 0, length, 0, 0,  # AnyPropertyType
+            ctypes.byref(actual_type), ctypes.byref(actual_format),
+            ctypes.byref(nitems), ctypes.byref(bytes_after), ctypes.byref(data)
+        )
+        if status != 0 or not data.value:
+            return None
+        try:
+            if actual_format.value == 32:
+                # 32-bit items are returned as C longs
+                size = nitems.value * ctypes.sizeof(ctypes.c_ulong)
+            else:
+                size = nitems.value * (actual_format.value // 8)
+            return actual_format.value, ctypes.string_at(data.value, size)
+        finally:
+            self._xlib.XFree(data)
+
+    def active_window_info(self) -> Optional[Tuple[str, str]]:
+        """Return (WM_CLASS class, title) of the active window, like xdotool."""
+        prop = self._get_property(self.root, self._atom_active_window, 1)
+        if prop is None or prop[0] != 32 or not prop[1]:
+            return None
+        window = ctypes.c_ulong.from_buffer_copy(prop[1]).value
+        if not window:
+            return None
+
+        hint = XClassHint()
+        if not self._xlib.XGetClassHint(self.display, window, ctypes.byref(hint)):
+            return None
+        try:
+            app_name = ctypes.string_at(hint.res_class).decode("utf-8", "replace") \
+                if hint.res_class else ""
+        finally:
+            if hint.res_name:
+                self._xlib.XFree(hint.res_name)
+            if hint.res_class:
+                self._xlib.XFree(hint.res_class)
+
+        title_prop = (self._get_property(window, self._atom_wm_name, 1024)
+                      or self._get_property(window, self._atom_legacy_name, 1024))
+        title = title_prop[1].decode("utf-8", "replace") if title_prop else ""
+
+        return (app_name, title)
+
+    def screen_on(self) -> Optional[bool]:
+        """
+        Return the monitor power state from the DPMS extension, if available.
+
+        Mirrors the `xset -q` check it replaces: the screen only counts as
+        on when DPMS is enabled and reports the On power level.
+        """
+        if self._xext is None or not self._dpms:
+            return None
+        if not self._xext.DPMSInfo(self.display, ctypes.byref(self._power_level),
+                                   ctypes.byref(self._dpms_state)):
+            return None
+        return bool(self._dpms_state.value) and self._power_level.value == DPMS_MODE_ON
+
+
+_display: Optional[X11Display] = None
+_tried = False
+
+
+def get_x11() -> Optional[X11Display]:
+    """Return the shared X11Display, or None if X11 is not usable."""
+    global _display, _tried
+
+    if _tried:
+        return _display
+    _tried = True
+
+    if not os.environ.get("DISPLAY"):
+        return None
+
+    xlib = _load_library("X11", "libX11.so.6")
+    if xlib is None:
+        return None
+
+    try:
+        _display = X11Display(
+            xlib,
+            _load_library("Xss", "libXss.so.1"),
+            _load_library("Xext", "libXext.so.6"),
+        )
+    except (OSError, AttributeError):
+        _display = None
+    return _display
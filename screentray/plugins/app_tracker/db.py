@@ -3,10 +3,9 @@ screentray/plugins/app_tracker/db.py
 
 Database operations for application tracking.
 """
-import sqlite3
 import datetime
-from typing import Optional
-from ...db.connection import get_cursor, DB_PATH
+from typing import List, Optional, Tuple
+from ...db.connection import get_cursor
 
 
 def ensure_tables() -> None:
@@ -34,13 +33,10 @@ def ensure_tables() -> None:
 
 def drop_tables() -> None:
     """Remove app_usage table (used during uninstall)."""
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("DROP TABLE IF EXISTS app_usage")
-    cur.execute("DROP INDEX IF EXISTS idx_app_usage_timestamp")
-    cur.execute("DROP INDEX IF EXISTS idx_app_usage_app_name")
-    conn.commit()
-    conn.close()
+    with get_cursor() as cur:
+        cur.execute("DROP TABLE IF EXISTS app_usage")
+        cur.execute("DROP INDEX IF EXISTS idx_app_usage_timestamp")
+        cur.execute("DROP INDEX IF EXISTS idx_app_usage_app_name")
 
 
 def insert_app_event(
@@ -58,16 +54,34 @@ def insert_app_event(
         window_title: Optional window title
         timestamp: Event timestamp (default: now)
     """
+    insert_app_events([(app_name, event_type, window_title)], timestamp)
+
+
+def insert_app_events(
+    events: List[Tuple[str, str, Optional[str]]],
+    timestamp: Optional[datetime.datetime] = None
+) -> None:
+    """
+    Insert several application events in a single transaction.
+
+    Args:
+        events: (app_name, event_type, window_title) tuples, in order
+        timestamp: Timestamp shared by all events (default: now)
+    """
+    if not events:
+        return
+
     if timestamp is None:
         timestamp = datetime.datetime.now()
 
     ts_str = timestamp.isoformat(timespec="seconds")
 
     with get_cursor() as cur:
-        cur.execute("""
+        cur.executemany("""
             INSERT INTO app_usage (timestamp, app_name, window_title, event_type)
             VALUES (?, ?, ?, ?)
-        """, (ts_str, app_name, window_title or "", event_type))
+        """, [(ts_str, app_name, window_title or "", event_type)
+              for app_name, event_type, window_title in events])
 
 
 def get_last_app_switch() -> Optional[tuple[str, str]]:
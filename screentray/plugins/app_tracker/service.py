@@ -4,8 +4,10 @@ screentray/plugins/app_tracker/service.py
 Business logic for app usage statistics.
 """
 import datetime
+import heapq
+from operator import itemgetter
 from typing import Dict, List, Tuple
-from ...db.connection import get_cursor
+from ...db.connection import get_read_cursor
 
 
 class AppUsageService:
@@ -32,7 +34,7 @@ class AppUsageService:
         if end.tzinfo is not None:
             end = end.replace(tzinfo=None)
 
-        with get_cursor() as cur:
+        with get_read_cursor() as cur:
             cur.execute("""
                 SELECT app_name, timestamp, event_type
                 FROM app_usage
@@ -104,13 +106,13 @@ class AppUsageService:
             List of (app_name, seconds) tuples sorted by usage
         """
         app_times = AppUsageService.get_app_usage_for_period(start, end)
-        sorted_apps = sorted(app_times.items(), key=lambda x: x[1], reverse=True)
-        return sorted_apps[:limit]
+        # Partial selection: only the top `limit` entries are ever ordered
+        return heapq.nlargest(limit, app_times.items(), key=itemgetter(1))
 
     @staticmethod
     def get_current_app() -> str | None:
         """Get the currently active application (last switch_to event)."""
-        with get_cursor() as cur:
+        with get_read_cursor() as cur:
             cur.execute("""
                 SELECT app_name
                 FROM app_usage
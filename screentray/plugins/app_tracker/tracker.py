@@ -3,7 +3,9 @@ screentray/plugins/app_tracker/tracker.py
 
 Active window monitoring for application tracking.
 """
-from typing import Optional, Tuple
+import datetime
+from typing import List, Optional, Tuple
+from ...config import SWITCH_MIN_DURATION
 from ...platform import get_platform
 
 
@@ -30,6 +32,11 @@ class AppTracker:
     def __init__(self) -> None:
         self.current_app: Optional[str] = None
         self.is_tracking: bool = False
+        # Candidate app that must hold focus for SWITCH_MIN_DURATION before
+        # it is recorded, so brief focus flashes (alt-tab, popups) are ignored
+        self.pending_app: Optional[str] = None
+        self.pending_title: str = ""
+        self.pending_since: Optional[datetime.datetime] = None
 
     def start(self) -> None:
         """Begin tracking (called when user becomes active)."""
@@ -44,6 +51,7 @@ class AppTracker:
             from .db import insert_app_event
             insert_app_event(self.current_app, "switch_from")
             self.current_app = None
+        self.pending_app = None
         self.is_tracking = False
 
     def poll(self) -> None:
@@ -69,16 +77,37 @@ class AppTracker:
         if not app_name or app_name == "":
             return
 
-        # Check if app changed
-        if app_name != self.current_app:
-            from .db import insert_app_event
+        if app_name == self.current_app:
+            # Focus came back before the candidate settled
+            self.pending_app = None
+            return
+
+        now = datetime.datetime.now()
+        if app_name != self.pending_app:
+            self.pending_app = app_name
+            self.pending_title = window_title
+            self.pending_since = now
+
+        # The first app after start is recorded right away; later switches
+        # only once the new app has kept focus long enough
+        since = self.pending_since or now
+        settled = (now - since).total_seconds() >= SWITCH_MIN_DURATION
+        if self.current_app is None or settled:
+            from .db import insert_app_events
+
+            events: List[Tuple[str, str, Optional[str]]] = []
 
             # Record switch_from for previous app
             if self.current_app:
-                insert_app_event(self.current_app, "switch_from")
+                events.append((self.current_app, "switch_from", None))
 
             # Record switch_to for new app
-            insert_app_event(app_name, "switch_to", window_title)
+            events.append((app_name, "switch_to", self.pending_title))
+
+            # Both sides of the switch share one transaction, dated to when
+            # the new app actually took focus
+            insert_app_events(events, since)
 
             self.current_app = app_name
+            self.pending_app = None
             print(f"App switch: {app_name}")
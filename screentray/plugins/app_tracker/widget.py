@@ -4,7 +4,8 @@ screentray/plugins/app_tracker/widget.py
 Qt widget for displaying app usage statistics in the tray popup.
 """
 import datetime
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QLayoutItem
+from typing import List
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton
 from .service import AppUsageService
 
 
@@ -40,6 +41,13 @@ class AppUsageWidget(QWidget):
         self.app_list_widget.setLayout(self.app_list_layout)
         self.main_layout.addWidget(self.app_list_widget)
 
+        # Row labels are created on demand and reused across refreshes
+        self.no_data_label = QLabel()
+        self.no_data_label.setStyleSheet("color: gray;")
+        self.no_data_label.hide()
+        self.app_list_layout.addWidget(self.no_data_label)
+        self.app_labels: List[QLabel] = []
+
         # Expand/collapse button
         self.toggle_button = QPushButton("Show More")
         self.toggle_button.clicked.connect(self.toggle_expanded)
@@ -74,30 +82,31 @@ class AppUsageWidget(QWidget):
         # Sort by time spent (descending)
         sorted_apps = sorted(usage.items(), key=lambda x: x[1], reverse=True)
 
-        # Clear existing labels
-        while self.app_list_layout.count():
-            child: QLayoutItem | None = self.app_list_layout.takeAt(0)
-            if child:
-                w = child.widget()
-                if w:
-                    w.deleteLater()
-
         # Determine how many to show
         limit = len(sorted_apps) if self.expanded else self.limit_collapsed
         apps_to_show = sorted_apps[:limit]
 
+        # Grow the label pool if needed, then hide rows beyond this refresh
+        while len(self.app_labels) < len(apps_to_show):
+            label = QLabel()
+            self.app_list_layout.addWidget(label)
+            self.app_labels.append(label)
+        for label in self.app_labels[len(apps_to_show):]:
+            label.hide()
+
         if not apps_to_show:
             # No data yet
-            no_data_label = QLabel(f"<i>No app usage recorded for {date_str}</i>")
-            no_data_label.setStyleSheet("color: gray;")
-            self.app_list_layout.addWidget(no_data_label)
+            self._set_text(self.no_data_label, f"<i>No app usage recorded for {date_str}</i>")
+            self.no_data_label.show()
             self.toggle_button.hide()
         else:
+            self.no_data_label.hide()
+
             # Display apps
-            for app_name, seconds in apps_to_show:
+            for label, (app_name, seconds) in zip(self.app_labels, apps_to_show):
                 time_str = self._format_duration(seconds)
-                label = QLabel(f"{app_name}: {time_str}")
-                self.app_list_layout.addWidget(label)
+                self._set_text(label, f"{app_name}: {time_str}")
+                label.show()
 
             # Update toggle button
             if len(sorted_apps) > self.limit_collapsed:
@@ -110,6 +119,12 @@ class AppUsageWidget(QWidget):
             else:
                 self.toggle_button.hide()
 
+    @staticmethod
+    def _set_text(label: QLabel, text: str) -> None:
+        """Set label text only when it changed."""
+        if label.text() != text:
+            label.setText(text)
+
     def toggle_expanded(self) -> None:
         """Toggle between showing 5 apps and showing all apps."""
         self.expanded = not self.expanded
@@ -120,10 +135,8 @@ class AppUsageWidget(QWidget):
         """
         Format seconds into readable duration.
         """
-        total_s = int(seconds)
-        h = total_s // 3600
-        m = (total_s % 3600) // 60
-        s = total_s % 60
+        m, s = divmod(int(seconds), 60)
+        h, m = divmod(m, 60)
 
         if h > 0:
             return f"{h}h {m}m"
@@ -3,7 +3,7 @@ Plugin discovery and lifecycle management with event system.
 """
 import os
 import importlib
-from typing import Optional, List
+from typing import Callable, Optional, List
 from .base import PluginBase
 from ..events import event_bus#, Event, EventContext
 
@@ -18,9 +18,7 @@ class PluginManager:
     Usage:
         manager = PluginManager()
         manager.discover_plugins()
-        manager.install_all()
-        manager.set_plugin_manager_for_all()
-        manager.start_all()
+        manager.initialize()  # install, wire up, register events, start
 
         # Emit event for plugins to handle
         manager.events.emit(
@@ -33,6 +31,8 @@ class PluginManager:
         self.plugins: dict[str, PluginBase] = {}
         self._active_state: str = "inactive"
         self.events = event_bus
+        # Bound poll() methods of started plugins, filled by start_all()
+        self.poll_hooks: List[Callable[[], None]] = []
 
     def discover_plugins(self) -> None:
         """
@@ -110,14 +110,46 @@ class PluginManager:
                 except Exception as e:
                     print(f"Failed to install plugin '{name}': {e}")
 
+    def initialize(self) -> None:
+        """
+        Install, wire up, register events for and start every plugin.
+
+        Each phase runs for all plugins before the next one begins, so no
+        plugin starts (and emits) before every plugin has registered its
+        handlers.
+        """
+        self.install_all()
+        self.set_plugin_manager_for_all()
+        self.register_events_for_all()
+        self.start_all()
+
+    def register_events_for_all(self) -> None:
+        """Let every plugin subscribe its handlers to the event bus."""
+        for name, plugin in self.plugins.items():
+            try:
+                plugin.register_events(self)
+            except Exception as e:
+                print(f"Error registering events for plugin '{name}': {e}")
+
     def start_all(self) -> None:
-        """Start all plugins (begin tracking/operation)."""
+        """
+        Start all plugins (begin tracking/operation).
+
+        Bound poll() methods of the plugins that started are collected into
+        poll_hooks in the same pass.
+        """
+        self.poll_hooks = []
         for name, plugin in self.plugins.items():
             try:
                 print(f"Starting plugin: {name}")
                 plugin.start()
             except Exception as e:
                 print(f"Failed to start plugin '{name}': {e}")
+                continue
+
+            poll = getattr(plugin, 'poll', None)
+            if callable(poll):
+                self.poll_hooks.append(poll)
 
     def stop_all(self) -> None:
         """Stop all plugins (cleanup resources)."""
@@ -14,6 +14,7 @@ from . import PLUGIN_INFO
 
 PORT_FILE = os.path.expanduser("~/.local/share/screentray_web_port")
 
+
 class WebPlugin(PluginBase):
     """
     Web dashboard plugin using event system for UI integration.
@@ -66,13 +67,20 @@ class WebPlugin(PluginBase):
         pass
 
     def _run_server(self) -> None:
-        """Run Flask server (executed in thread)."""
+        """
+        Run Flask server (executed in thread).
+
+        Requests are served one at a time on this thread, so they all reuse
+        its database connection; a thread per request would open (and set
+        up) a new connection for every request.
+        """
         if self.flask_app and self.server_port:
             self.flask_app.run(
                 host="127.0.0.1",
                 port=self.server_port,
                 debug=False,
-                use_reloader=False
+                use_reloader=False,
+                threaded=False
             )
 
     def _on_tray_menu_ready(self, ctx: TrayReadyContext) -> None:
@@ -80,7 +88,8 @@ class WebPlugin(PluginBase):
         menu = ctx.menu
 
         # Create disabled menu item immediately
-        first_action = menu.actions()[0] if menu.actions() else None
+        actions = menu.actions()
+        first_action = actions[0] if actions else None
         self.tray_action = QAction("Open Web Dashboard", menu)
         self.tray_action.triggered.connect(self._open_dashboard)
         self.tray_action.setEnabled(False)
@@ -88,7 +97,8 @@ class WebPlugin(PluginBase):
 
         if first_action:
             menu.insertAction(first_action, self.tray_action)
-            menu.insertSeparator(menu.actions()[1])
+            # The new action now sits before first_action
+            menu.insertSeparator(first_action)
         else:
             menu.addAction(self.tray_action) # pyright: ignore[reportUnknownMemberType]
             menu.addSeparator()
@@ -5,27 +5,37 @@ from flask import Flask, jsonify, request
 import sqlite3
 import datetime
 import os
-from typing import Any, List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 from ....services import StatsService, ActivityService
+from ....db.connection import get_read_connection, DB_PATH
 
 
-DB_PATH = os.path.expanduser("~/.local/share/screentracker.db")
-
 def register_routes(app: Flask) -> None:
     """Register core API routes with Flask app."""
 
+    # Checked once at startup; later queries surface sqlite errors instead
+    if not os.path.exists(DB_PATH):
+        print(f"Warning: DB not found at {DB_PATH}")
+
     stats_service = StatsService()
     activity_service = ActivityService()
 
     @app.route("/api/events")
     def api_events() -> Any: # pyright: ignore[reportUnusedFunction]
         try:
+            before_ts = request.args.get("before_ts")
+            before_id = request.args.get("before_id")
+            if (before_ts is None) != (before_id is None):
+                return jsonify({"error": "before_ts and before_id must be given together"}), 400
+
             return jsonify(list_events(
                 limit=int(request.args.get("limit", "200")),
-                offset=int(request.args.get("offset", "0")),
+                before=(before_ts, int(before_id)) if before_ts is not None and before_id is not None else None,
                 query=request.args.get("q")
             ))
-        except FileNotFoundError as e:
+        except ValueError as e:
+            return jsonify({"error": f"Invalid parameter: {e}"}), 400
+        except sqlite3.OperationalError as e:
             return jsonify({"error": str(e)}), 404
 
     @app.route("/api/periods")
@@ -33,7 +43,7 @@ def register_routes(app: Flask) -> None:
         try:
             hours = int(request.args.get("hours", "24"))
             return jsonify(activity_service.get_detailed_activity_periods(hours))
-        except FileNotFoundError as e:
+        except sqlite3.OperationalError as e:
             return jsonify({"error": str(e)}), 404
 
     @app.route("/api/stats/<day_str>")
@@ -55,6 +65,30 @@ def register_routes(app: Flask) -> None:
             traceback.print_exc()
             return jsonify({"error": str(e)}), 500
 
+    @app.route("/api/snapshot")
+    def api_snapshot() -> Any: # pyright: ignore[reportUnusedFunction]
+        """
+        Batched dashboard load: daily stats and periods in one response.
+        The dashboard builds its hourly chart for the selected day from
+        the periods, so nothing else is computed here.
+        """
+        try:
+            day_str = request.args.get("date", datetime.date.today().isoformat())
+            hours = int(request.args.get("hours", "24"))
+
+            return jsonify({
+                "stats": get_daily_stats(stats_service, day_str),
+                "periods": activity_service.get_detailed_activity_periods(hours),
+            })
+        except ValueError as e:
+            return jsonify({"error": f"Invalid parameter: {e}"}), 400
+        except sqlite3.OperationalError as e:
+            return jsonify({"error": str(e)}), 404
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({"error": str(e)}), 500
+
     @app.route("/api/daily/range")
     def api_daily_range() -> Any: # pyright: ignore[reportUnusedFunction]
         """Get daily totals for date range."""
@@ -78,33 +112,47 @@ def register_routes(app: Flask) -> None:
 
 
 def open_conn() -> sqlite3.Connection:
-    """Open database connection."""
-    if not os.path.exists(DB_PATH):
-        raise FileNotFoundError(f"DB not found at {DB_PATH}")
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """
+    Return the server thread's read-only connection.
+
+    The routes only read, so they share it with the services instead of
+    opening a writer connection next to it.
+    """
+    return get_read_connection()
+
+
+def list_events(limit: int = 200, before: Optional[Tuple[str, int]] = None,
+                query: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    List recent events (newest first) with optional search.
+
+    Uses keyset pagination: pass the (timestamp, id) of the last event of
+    the previous page as before to fetch the next one. Unlike OFFSET, this
+    seeks idx_events_timestamp directly, so deep pages cost the same as
+    the first. Ties on timestamp are broken by id.
+    """
+    conditions: List[str] = []
+    params: List[Any] = []
+    if query:
+        q = f"%{query}%"
+        conditions.append("(type LIKE ? OR detail LIKE ?)")
+        params += [q, q]
+    if before:
+        conditions.append("(timestamp, id) < (?, ?)")
+        params += list(before)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
-
-def list_events(limit: int = 200, offset: int = 0, query: Optional[str] = None) -> List[Dict[str, Any]]:
-    """List recent events with optional search."""
     # This function is UI-specific (pagination/search) and can keep its own DB logic.
     with open_conn() as conn:
         cur = conn.cursor()
-        if query:
-            q = f"%{query}%"
-            cur.execute("""
-                SELECT id, timestamp, type, detail
-                FROM events
-                WHERE type LIKE ? OR detail LIKE ?
-                ORDER BY timestamp DESC LIMIT ? OFFSET ?
-            """, (q, q, limit, offset))
-        else:
-            cur.execute("""
-                SELECT id, timestamp, type, detail
-                FROM events ORDER BY timestamp DESC LIMIT ? OFFSET ?
-            """, (limit, offset))
-        return [dict(r) for r in cur.fetchall()]
+        cur.execute(f"""
+            SELECT id, timestamp, type, detail
+            FROM events
+            {where}
+            ORDER BY timestamp DESC, id DESC LIMIT ?
+        """, params + [limit])
+        return [{"id": r[0], "timestamp": r[1], "type": r[2], "detail": r[3]}
+                for r in cur.fetchall()]
 
 
 
@@ -125,7 +173,7 @@ def get_daily_stats(stats_service: StatsService, day_str: str) -> Dict[str, Any]
             GROUP BY type
         """, (start.isoformat(), end.isoformat()))
 
-        event_counts = {row["type"]: row["count"] for row in cur.fetchall()}
+        event_counts = {row[0]: row[1] for row in cur.fetchall()}
 
     # This part already correctly uses the service
     totals = stats_service.get_daily_totals(day_str)
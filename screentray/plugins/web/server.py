@@ -2,21 +2,43 @@
 Flask server for web dashboard with plugin extension support.
 """
 from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
 from typing import List, Any
 import os
 import socket
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, stdlib json is used otherwise
+    orjson = None
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (much faster than stdlib json)."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default).decode()  # pyright: ignore[reportOptionalMemberAccess]
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)  # pyright: ignore[reportOptionalMemberAccess]
+
 
 def find_free_port(preferred: int = 5050) -> int:
     """Try preferred port, fall back if unavailable."""
     for port in (preferred, 8080, 5000):
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            # Allow rebinding a port still in TIME_WAIT from the previous run
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             try:
                 s.bind(("127.0.0.1", port))
                 return port
             except OSError:
                 continue
-    raise RuntimeError("No free port found (5050/8080/5000 busy)")
+
+    # All well-known ports busy - let the OS pick one
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
 
 
 def create_app(plugins_with_web: List[Any]) -> Flask:
@@ -30,6 +52,10 @@ def create_app(plugins_with_web: List[Any]) -> Flask:
                 static_folder="static",
                 static_url_path="")
 
+    # jsonify() transparently uses orjson when it is installed
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+
     # Register core routes (data APIs)
     from .routes import core_routes
     core_routes.register_routes(app)
@@ -119,16 +145,19 @@ def inject_plugin_content(html: str, plugins: List[Any]) -> str:
 
     # Inject new tabs into navigation
     if plugin_tabs:
-        tab_nav_html = ''
-        tab_content_html = ''
+        nav_parts: List[str] = []
+        content_parts: List[str] = []
 
         for tab in plugin_tabs:
             tab_id = tab['id']
             tab_title = tab['title']
             # Proper indentation for nav items
-            tab_nav_html += f'    <li><a href="#" role="button" data-tab="{tab_id}">{tab_title}</a></li>\n'
+            nav_parts.append(f'    <li><a href="#" role="button" data-tab="{tab_id}">{tab_title}</a></li>\n')
             # Proper indentation for content sections
-            tab_content_html += f'  <section class="tab-content" id="{tab_id}">\n{tab["content"]}\n  </section>\n\n'
+            content_parts.append(f'  <section class="tab-content" id="{tab_id}">\n{tab["content"]}\n  </section>\n\n')
+
+        tab_nav_html = ''.join(nav_parts)
+        tab_content_html = ''.join(content_parts)
 
         # Inject navigation items before plugin tabs marker
         html = html.replace('<!-- PLUGIN_TABS -->', tab_nav_html + '<!-- PLUGIN_TABS -->')
@@ -59,8 +59,14 @@ async function loadDailyView() {
   const dateStr = formatDate(currentDate);
   document.getElementById("daily-date").value = dateStr;
 
-  const resp = await fetch(`${API}/stats/${dateStr}`);
-  const stats = await resp.json();
+  // Hourly breakdown needs periods reaching back to the start of the selected day
+  const startOfDay = new Date(currentDate);
+  startOfDay.setHours(0, 0, 0, 0);
+  const now = new Date();
+  const hoursFromNow = Math.ceil((now - startOfDay) / (1000 * 60 * 60));
+
+  const resp = await fetch(`${API}/snapshot?date=${dateStr}&hours=${Math.max(hoursFromNow, 24)}`);
+  const { stats, periods: allPeriods } = await resp.json();
 
   document.getElementById("daily-stats").innerHTML = `
     <article style="padding: 0.75rem;">
@@ -76,14 +82,6 @@ async function loadDailyView() {
   `;
 
   // Hourly breakdown
-  const startOfDay = new Date(currentDate);
-  startOfDay.setHours(0, 0, 0, 0);
-  const now = new Date();
-  const hoursFromNow = Math.ceil((now - startOfDay) / (1000 * 60 * 60));
-
-  const hourlyResp = await fetch(`${API}/periods?hours=${Math.max(hoursFromNow, 24)}`);
-  const allPeriods = await hourlyResp.json();
-
   const hourlyData = new Array(24).fill(0);
 
   allPeriods.forEach(p => {
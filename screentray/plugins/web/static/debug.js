@@ -2,6 +2,8 @@ const API = "/api";
 let periods = [];
 let selectedIndex = -1;
 let periodsDisplayed = 20;
+let eventQuery = "";
+let lastEvent = null;
 
 function setupTabSwitching() {
   document.querySelectorAll('#tab-nav-list a[role="button"]').forEach(tab => {
@@ -187,13 +189,21 @@ function togglePeriodEvents(event) {
     : `Hide Events (${periods[selectedIndex].events.length})`;
 }
 
-async function loadEventsList(q = "") {
+async function loadEventsList(q = "", more = false) {
+  if (!more) {
+    eventQuery = q;
+    lastEvent = null;
+  }
   const limit = document.getElementById("event-limit").value;
-  const resp = await fetch(`${API}/events?limit=${limit}&offset=0${q ? "&q=" + encodeURIComponent(q) : ""}`);
+  // Next page starts after the last event shown (keyset cursor)
+  const cursor = lastEvent
+    ? `&before_ts=${encodeURIComponent(lastEvent.timestamp)}&before_id=${lastEvent.id}`
+    : "";
+  const resp = await fetch(`${API}/events?limit=${limit}${eventQuery ? "&q=" + encodeURIComponent(eventQuery) : ""}${cursor}`);
   const events = await resp.json();
 
   const container = document.getElementById("event-list");
-  container.innerHTML = "";
+  if (!more) container.innerHTML = "";
 
   const stateEvents = ['idle_start', 'idle_end', 'screen_off', 'screen_on'];
 
@@ -211,6 +221,10 @@ async function loadEventsList(q = "") {
     `;
     container.appendChild(div);
   });
+
+  if (events.length > 0) lastEvent = events[events.length - 1];
+  document.getElementById("event-more").style.display =
+    events.length >= Number(limit) ? "block" : "none";
 }
 
 // Event listeners
@@ -230,6 +244,9 @@ document.getElementById("event-search-btn").onclick = () => {
 document.getElementById("event-limit").onchange = () => {
   loadEventsList(document.getElementById("event-search").value);
 };
+document.getElementById("event-more").onclick = () => {
+  loadEventsList(eventQuery, true);
+};
 
 // Init
 window.onload = () => {
@@ -1,35 +1,174 @@
 """Service for activity period calculations."""
+import bisect
 import datetime
-from typing import Any, List, Dict
+import itertools
+from typing import Any, List, Dict, Optional, Set, Tuple
 from ..db.event_repository import EventRepository
+from ..db.daily_totals_repository import DailyTotalsRepository
 from ..models import Event
-from ..config import MAX_NO_EVENT_GAP
+from ..config import IDLE_THRESHOLD_MS, MAX_NO_EVENT_GAP
+
+# State implied by each state-changing event type
+_STATE_BY_TYPE: Dict[str, str] = {
+    **{t: "active" for t in EventRepository.ACTIVE_EVENTS},
+    **{t: "inactive" for t in EventRepository.INACTIVE_EVENTS},
+}
+_STATE_EVENT_TYPES = tuple(_STATE_BY_TYPE)
+
+# Days whose parsed state changes are kept in memory
+DAY_CACHE_SIZE = 64
+
+# Inactive periods shorter than this are stored as short idle in the rollup
+IDLE_THRESHOLD_SEC = IDLE_THRESHOLD_MS // 1000
+
+# (timestamp, event id, state) for one state-changing event
+StateChange = Tuple[datetime.datetime, int, str]
+
+
+def _state_runs(changes: List[StateChange], period_start: datetime.datetime,
+                period_end: datetime.datetime
+                ) -> List[Tuple[datetime.datetime, datetime.datetime, str, float]]:
+    """
+    (start, end, state, seconds) for each run of one state, empty runs dropped.
+
+    Only changes that switch state bound a run; repeated events of the
+    same state (screen_on then idle_end) are skipped in a first pass, so
+    durations are computed once per run rather than tracked per event.
+    """
+    states = ["inactive"]  # Default to inactive before the first change
+    bounds = [period_start]
+    for ts, _, state in changes:
+        if state != states[-1]:
+            states.append(state)
+            bounds.append(ts)
+    bounds.append(period_end)
+
+    runs: List[Tuple[datetime.datetime, datetime.datetime, str, float]] = []
+    for start, end, state in zip(bounds, bounds[1:], states):
+        duration = (end - start).total_seconds()
+        if duration > 0:
+            runs.append((start, end, state, duration))
+    return runs
 
 
 class ActivityService:
     """Handles activity period analysis."""
 
+    # day -> (highest event id seen, parsed state changes in time order);
+    # events are append-only, so later calls only fetch newer ids. Shared by
+    # every instance in the process (tray, popup, activity bar, web routes).
+    # Cached lists are never modified in place, so a fold running in another
+    # thread keeps a consistent snapshot.
+    _day_cache: Dict[datetime.date, Tuple[int, List[StateChange]]] = {}
+
     def __init__(self) -> None:
         self.repo = EventRepository()
+        self.daily_repo = DailyTotalsRepository()
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget cached day state changes (e.g. after switching databases)."""
+        cls._day_cache.clear()
 
-    def get_activity_periods_for_day(self, day: datetime.date) -> List[Dict[str, Any]]:
+    def get_activity_periods_for_day(self, day: datetime.date,
+                                     now: Optional[datetime.datetime] = None
+                                     ) -> List[Dict[str, Any]]:
         """
         Get all *simple* activity periods for a specific day.
         Used by StatsService for historical totals.
+
+        Pass now to clip today's periods against a clock read the caller
+        already made; it is read here otherwise.
+        """
+        changes, start, end = self._day_state_changes(day)
+        return self._fold_state_changes(changes, start, end, now)
+
+    def _day_state_changes(self, day: datetime.date, top_up: bool = True) -> Tuple[
+            List[StateChange], datetime.datetime, datetime.datetime]:
+        """
+        Cached state changes of a day, topped up with events added since.
+
+        Pass top_up=False for a day the caller has just loaded; its cached
+        changes are returned as they are, without another query.
         """
         start = datetime.datetime.combine(day, datetime.time.min)
         end = datetime.datetime.combine(day, datetime.time.max)
 
-        events = self.repo.find_events_in_period(start, end)
-        return self._build_simple_periods(events, start, end)
+        cached = self._day_cache.get(day)
+        if cached is not None and not top_up:
+            return cached[1], start, end
+        if cached is None:
+            if len(self._day_cache) >= DAY_CACHE_SIZE:
+                self._day_cache.clear()
+            last_id, changes = 0, []
+        else:
+            last_id, changes = cached
+
+        rows = self.repo.find_rows_since(start, end, last_id, _STATE_EVENT_TYPES)
+        if rows:
+            changes = changes.copy()
+        state_by_type = _STATE_BY_TYPE
+        parse = datetime.datetime.fromisoformat
+        for event_id, timestamp, typ in rows:
+            # Backdated events (e.g. idle_start) can sort before cached ones
+            bisect.insort(changes, (parse(timestamp), event_id, state_by_type[typ]))
+            last_id = max(last_id, event_id)
+        self._day_cache[day] = (last_id, changes)
+
+        return changes, start, end
+
+    def _warm_day_cache(self, days: List[datetime.date]) -> Set[datetime.date]:
+        """
+        Load state changes for uncached days with one query over their span.
+
+        Used before folding many days at once, so a cold multi-day range
+        costs a single scan instead of one query per day. Returns the days
+        loaded; they are current as of that scan and need no top-up.
+        """
+        missing = [d for d in days if d not in self._day_cache]
+        if len(missing) < 2:
+            return set()
+
+        start = datetime.datetime.combine(min(missing), datetime.time.min)
+        end = datetime.datetime.combine(max(missing), datetime.time.max)
+        rows = self.repo.find_rows_since(start, end, 0, _STATE_EVENT_TYPES)
+
+        by_day: Dict[datetime.date, List[StateChange]] = {d: [] for d in missing}
+        state_by_type = _STATE_BY_TYPE
+        parse = datetime.datetime.fromisoformat
+        for event_id, timestamp, typ in rows:
+            ts = parse(timestamp)
+            changes = by_day.get(ts.date())
+            if changes is not None:
+                changes.append((ts, event_id, state_by_type[typ]))
+
+        # One snapshot covered the whole span, so every event of these days
+        # up to the highest id returned is already included
+        last_id = max((r[0] for r in rows), default=0)
+        if len(self._day_cache) + len(missing) > DAY_CACHE_SIZE:
+            self._day_cache.clear()
+        for day, changes in by_day.items():
+            changes.sort()
+            self._day_cache[day] = (last_id, changes)
+        return set(by_day)
 
     def get_activity_periods_last_24h(self) -> List[Dict[str, Any]]:
-        """Get *simple* activity periods for the last 24 hours."""
+        """
+        Get *simple* activity periods for the last 24 hours.
+
+        The window spans yesterday and today, so it is cut from those days'
+        cached state changes; a refresh only fetches events written since.
+        """
         end = datetime.datetime.now()
         start = end - datetime.timedelta(hours=24)
 
-        events = self.repo.find_events_in_period(start, end)
-        return self._build_simple_periods(events, start, end)
+        changes = [
+            change
+            for day in (start.date(), end.date())
+            for change in self._day_state_changes(day)[0]
+            if start <= change[0] <= end
+        ]
+        return self._fold_state_changes(changes, start, end, now=end)
 
     def get_hourly_breakdown_24h(self) -> List[Dict[str, Any]]:
         """
@@ -100,17 +239,37 @@ class ActivityService:
         """
         Get daily active/inactive totals for date range.
         Returns list of {date: str, active_seconds: float, inactive_seconds: float}.
+
+        Days before yesterday are read from the daily_totals rollup and
+        computed (then stored) only the first time they are requested.
+        Yesterday and today are always computed, since late events such as
+        a backdated idle_start can still land in them.
         """
         results: List[Dict[str, Any]] = []
+        now = datetime.datetime.now()  # One clock read for every day in the range
+        settled_before = now.date() - datetime.timedelta(days=1)
+        stored = self.daily_repo.find_range(start_date, end_date)
+        new_rows: List[Tuple[str, float, float, float]] = []
+
+        span = (end_date - start_date).days + 1
+        warmed = self._warm_day_cache([
+            day for day in (start_date + datetime.timedelta(days=i) for i in range(span))
+            if day.isoformat() not in stored
+        ])
+
         current = start_date
 
         while current <= end_date:
-            periods = self.get_activity_periods_for_day(current)
+            day_str = current.isoformat()
+            if day_str in stored:
+                active_sec, inactive_sec = stored[day_str]
+            else:
+                active_sec, inactive_sec, short_idle_sec = self._sum_state_seconds(
+                    *self._day_state_changes(current, top_up=current not in warmed), now=now
+                )
 
-            active_sec = sum(p["duration_seconds"] for p in periods
-                           if p["state"] == "active")
-            inactive_sec = sum(p["duration_seconds"] for p in periods
-                             if p["state"] == "inactive")
+                if current < settled_before:
+                    new_rows.append((day_str, active_sec, inactive_sec, short_idle_sec))
 
             results.append({
                 "date": current.isoformat(),
@@ -121,84 +280,99 @@ class ActivityService:
 
             current += datetime.timedelta(days=1)
 
+        if new_rows:
+            self.daily_repo.save_many(new_rows)
+
         return results
 
     def _build_simple_periods(self, events: List[Event], period_start: datetime.datetime,
-                              period_end: datetime.datetime) -> List[Dict[str, Any]]:
+                              period_end: datetime.datetime,
+                              now: Optional[datetime.datetime] = None) -> List[Dict[str, Any]]:
         """
         Build simple activity periods from state-changing events only.
         This method does NOT do gap detection.
         """
-        if not events:
+        # Non-state events don't trigger state changes
+        state_by_type = _STATE_BY_TYPE
+        changes = [
+            (e.ts, e.id, state_by_type[e.type])
+            for e in events if e.type in state_by_type
+        ]
+        return self._fold_state_changes(changes, period_start, period_end, now)
+
+    def _fold_state_changes(self, changes: List[StateChange], period_start: datetime.datetime,
+                            period_end: datetime.datetime,
+                            now: Optional[datetime.datetime] = None) -> List[Dict[str, Any]]:
+        """Turn time-ordered state changes into periods, ending no later than now."""
+        # For today, 'now' is earlier than 'period_end', so 'now' is used.
+        effective_end = min(period_end, now or datetime.datetime.now())
+
+        if not changes:
             # No events = entire period is inactive
-            duration = (period_end - period_start).total_seconds()
+            duration = (effective_end - period_start).total_seconds()
             return [{
                 "start": period_start,
-                "end": period_end,
+                "end": effective_end,
                 "state": "inactive",
                 "duration_seconds": duration
             }]
 
-        periods: List[Dict[str, Any]] = []
-        last_ts = period_start
-        last_state = "inactive"  # Default to inactive
-
-        for event in events:
-            event_ts = datetime.datetime.fromisoformat(event.timestamp)
-
-            # Determine state based on event type
-            if event.type in EventRepository.INACTIVE_EVENTS:
-                new_state = "inactive"
-            elif event.type in EventRepository.ACTIVE_EVENTS:
-                new_state = "active"
-            else:
-                # Non-state events don't trigger state changes
-                continue
+        return [
+            {"start": start, "end": end, "state": state, "duration_seconds": duration}
+            for start, end, state, duration in _state_runs(changes, period_start, effective_end)
+        ]
 
-            # State change - close previous period
-            if new_state != last_state:
-                duration = (event_ts - last_ts).total_seconds()
-                if duration > 0:
-                    periods.append({
-                        "start": last_ts,
-                        "end": event_ts,
-                        "state": last_state,
-                        "duration_seconds": duration
-                    })
-                last_ts = event_ts
-                last_state = new_state
-
-        # For today, 'now' is earlier than 'period_end', so 'now' is used.
-        now = datetime.datetime.now()
-        effective_end = min(period_end, now)
-
-        # Add final period up to the effective_end
-        if last_ts < effective_end:
-            duration = (effective_end - last_ts).total_seconds()
-            if duration > 0:
-                periods.append({
-                    "start": last_ts,
-                    "end": effective_end,
-                    "state": last_state,
-                    "duration_seconds": duration
-                })
-
-        return periods
-
-    def get_detailed_activity_periods(self, hours: int = 24) -> List[Dict[str, Any]]:
+    def _sum_state_seconds(self, changes: List[StateChange], period_start: datetime.datetime,
+                           period_end: datetime.datetime,
+                           now: Optional[datetime.datetime] = None) -> Tuple[float, float, float]:
+        """
+        (active, inactive, short inactive) seconds of the periods
+        _fold_state_changes would build, added up directly for callers that
+        only need the totals. Short inactive periods are those under the
+        idle threshold, which the popup counts as active.
+        """
+        effective_end = min(period_end, now or datetime.datetime.now())
+
+        if not changes:
+            duration = (effective_end - period_start).total_seconds()
+            return 0.0, duration, (duration if duration < IDLE_THRESHOLD_SEC else 0.0)
+
+        totals = {"active": 0.0, "inactive": 0.0}
+        short_idle = 0.0
+        for _, _, state, duration in _state_runs(changes, period_start, effective_end):
+            totals[state] += duration
+            if state == "inactive" and duration < IDLE_THRESHOLD_SEC:
+                short_idle += duration
+        return totals["active"], totals["inactive"], short_idle
+
+    def get_detailed_activity_periods(self, hours: int = 24, iso: bool = True,
+                                      include_events: bool = True) -> List[Dict[str, Any]]:
         """
         Get detailed activity periods, including gap detection and raw events.
         This is the consolidated logic previously in SessionService and core_routes.
+
+        Period start/end are ISO strings for JSON consumers; pass iso=False
+        to get datetimes instead and skip the format/parse round-trip.
+        Callers that only need the periods themselves pass
+        include_events=False; no per-event dicts are built, and each
+        period's events list is empty and trigger_event None (except gaps).
         """
         now = datetime.datetime.now()
         since = now - datetime.timedelta(hours=hours)
+        # The only computed bounds; event bounds reuse the stored strings
+        now_iso = now.isoformat()
+        since_iso = since.isoformat()
 
-        events = self.repo.find_events_in_period(since, now)
+        # Newest event by rowid is a single page read; when it predates the
+        # window (cold start, after suspend) the range scan cannot find anything
+        latest = self.repo.get_latest_timestamp()
+        events = (self.repo.find_events_in_period(since, now)
+                  if latest is not None and latest >= since_iso else [])
 
         if not events:
             return [{
-                "start": since.isoformat(),
-                "end": now.isoformat(),
+                "start": since_iso if iso else since,
+                "end": now_iso if iso else now,
                 "state": "inactive",
                 "duration_sec": (now - since).total_seconds(),
                 "trigger_event": None,
@@ -206,134 +380,83 @@ class ActivityService:
             }]
 
         periods: List[Dict[str, Any]] = []
-        last_ts = since
+        last_ts, last_ts_iso = since, since_iso
         last_state = "inactive"  # Assume inactive before first event
-        last_event_ts = since
+        last_event_ts, last_event_ts_iso = since, since_iso
         current_events: List[Dict[str, Any]] = []
+        state_by_type = _STATE_BY_TYPE  # local for the per-event lookups below
+        max_gap = datetime.timedelta(seconds=MAX_NO_EVENT_GAP)
+
+        def emit(start: datetime.datetime, start_iso: str,
+                 end: datetime.datetime, end_iso: str, state: str,
+                 trigger: Optional[Dict[str, Any]], evs: List[Dict[str, Any]]) -> None:
+            # Zero-duration periods are tracker restart artifacts; never emit them
+            duration = (end - start).total_seconds()
+            if duration <= 0:
+                return
+            periods.append({
+                "start": start_iso if iso else start,
+                "end": end_iso if iso else end,
+                "state": state,
+                "duration_sec": duration,
+                "trigger_event": trigger,
+                "events": evs
+            })
 
-        for event in events:
-            ts = datetime.datetime.fromisoformat(event.timestamp)
-            typ = event.type
+        # A trailing (now, None) entry runs the gap check against the end of
+        # the window in the same pass as the events
+        timeline = itertools.chain(
+            ((e.ts, e.timestamp, e) for e in events), ((now, now_iso, None),)
+        )
+        for ts, ts_iso, event in timeline:
+            # Check for gaps (no events > threshold = inactive). While already
+            # inactive the gap just extends the period until the state changes,
+            # so only active stretches pay for the subtraction
+            if last_state == "active" and ts - last_event_ts > max_gap:
+                # Close active period, add gap
+                gap = (ts - last_event_ts).total_seconds()
+                emit(last_ts, last_ts_iso, last_event_ts, last_event_ts_iso,
+                     last_state, None, current_events)
+                emit(last_event_ts, last_event_ts_iso, ts, ts_iso, "inactive",
+                     {"type": "gap", "detail": f"{gap:.0f}s gap"}, [])
+                last_ts, last_ts_iso = ts, ts_iso
+                last_state = "inactive"
+                current_events = []
+
+            if event is None:
+                break
 
-            event_dict: Dict[str, Any] = {
+            typ = event.type
+            event_dict: Optional[Dict[str, Any]] = {
                 "id": event.id,
                 "timestamp": event.timestamp,
                 "type": typ,
                 "detail": event.detail or ""
-            }
-
-            # Check for gaps (no events > threshold = inactive)
-            gap = (ts - last_event_ts).total_seconds()
-            if gap > MAX_NO_EVENT_GAP:
-                # Gap detected - insert inactive period
-                if last_state == "active":
-                    # Close active period, add gap
-                    periods.append({
-                        "start": last_ts.isoformat(),
-                        "end": last_event_ts.isoformat(),
-                        "state": last_state,
-                        "duration_sec": (last_event_ts - last_ts).total_seconds(),
-                        "trigger_event": None,
-                        "events": current_events.copy()
-                    })
-                    periods.append({
-                        "start": last_event_ts.isoformat(),
-                        "end": ts.isoformat(),
-                        "state": "inactive",
-                        "duration_sec": gap,
-                        "trigger_event": {"type": "gap", "detail": f"{gap:.0f}s gap"},
-                        "events": []
-                    })
-                    last_ts = ts
-                    last_state = "inactive"
-                    current_events = []
-                else:
-                    # Already inactive, just extend the gap
-                    pass # We'll handle this when the state *changes*
+            } if include_events else None
 
             # Determine state from event type
-            if typ in EventRepository.INACTIVE_EVENTS:
-                new_state = "inactive"
-            elif typ in EventRepository.ACTIVE_EVENTS:
-                new_state = "active"
-            elif typ == "poll" and event.detail:
-                # Poll events contain state info
-                if "state=active" in event.detail:
-                    new_state = "active"
-                elif "state=inactive" in event.detail:
-                    new_state = "inactive"
-                else:
-                    # Non-state poll - add to current period
+            # Poll events contain state info
+            new_state = state_by_type.get(typ) or event.poll_state
+            if new_state is None:
+                # Non-state event (tracker_start, tracker_stop, stateless
+                # poll) - add to current period
+                if event_dict:
                     current_events.append(event_dict)
-                    last_event_ts = ts
-                    continue
-            else:
-                # Non-state event (tracker_start, tracker_stop) - add to current period
-                current_events.append(event_dict)
-                last_event_ts = ts
+                last_event_ts, last_event_ts_iso = ts, ts_iso
                 continue
 
             # State changed - close previous period
             if new_state != last_state:
-                periods.append({
-                    "start": last_ts.isoformat(),
-                    "end": ts.isoformat(),
-                    "state": last_state,
-                    "duration_sec": (ts - last_ts).total_seconds(),
-                    "trigger_event": event_dict,
-                    "events": current_events.copy()
-                })
-                current_events = [event_dict]
-                last_ts = ts
+                emit(last_ts, last_ts_iso, ts, ts_iso, last_state, event_dict, current_events)
+                current_events = [event_dict] if event_dict else []
+                last_ts, last_ts_iso = ts, ts_iso
                 last_state = new_state
-            else:
+            elif event_dict:
                 current_events.append(event_dict)
 
-            last_event_ts = ts
-
-        # Check for gap at end
-        gap = (now - last_event_ts).total_seconds()
-        if gap > MAX_NO_EVENT_GAP:
-            # Large gap at end - force inactive
-            if last_state == "active":
-                periods.append({
-                    "start": last_ts.isoformat(),
-                    "end": last_event_ts.isoformat(),
-                    "state": last_state,
-                    "duration_sec": (last_event_ts - last_ts).total_seconds(),
-                    "trigger_event": None,
-                    "events": current_events
-                })
-                periods.append({
-                    "start": last_event_ts.isoformat(),
-                    "end": now.isoformat(),
-                    "state": "inactive",
-                    "duration_sec": gap,
-                    "trigger_event": {"type": "gap", "detail": f"{gap:.0f}s gap"},
-                    "events": []
-                })
-            else:
-                # Already inactive, extend to now
-                periods.append({
-                    "start": last_ts.isoformat(),
-                    "end": now.isoformat(),
-                    "state": last_state,
-                    "duration_sec": (now - last_ts).total_seconds(),
-                    "trigger_event": None,
-                    "events": current_events
-                })
-        else:
-            # Normal final period
-            periods.append({
-                "start": last_ts.isoformat(),
-                "end": now.isoformat(),
-                "state": last_state,
-                "duration_sec": (now - last_ts).total_seconds(),
-                "trigger_event": None,
-                "events": current_events
-            })
+            last_event_ts, last_event_ts_iso = ts, ts_iso
 
-        # REVIEW: Filter out zero-duration periods (tracker restart artifacts)
-        periods = [p for p in periods if p["duration_sec"] > 0]
+        # Final period runs to now
+        emit(last_ts, last_ts_iso, now, now_iso, last_state, None, current_events)
 
         return periods
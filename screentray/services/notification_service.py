@@ -5,7 +5,44 @@ class NotificationService:
     """Handles desktop notifications with action support."""
 
     def __init__(self) -> None:
-        self._dbus_handler: Optional[Callable[[int, str], None]] = None
+        self._interface: Optional[object] = None
+        # Action callbacks of notifications still on screen, by notification id
+        self._action_callbacks: Dict[int, Dict[str, Callable[[], None]]] = {}
+
+    def _get_interface(self) -> object:
+        """
+        Connect to the notification daemon on first use.
+
+        The bus, proxy and signal receivers are set up once; a failed
+        attempt is retried on the next notification. The proxy follows the
+        service name, so a restarted notification daemon is picked up
+        without reconnecting.
+        """
+        if self._interface is None:
+            import dbus  # type: ignore[import-untyped]
+            import dbus.mainloop.glib  # type: ignore[import-untyped]
+
+            dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)  # type: ignore[reportUnknownMemberType]
+            bus: dbus.SessionBus = dbus.SessionBus()  # type: ignore[reportUnknownMemberType]
+            obj = bus.get_object("org.freedesktop.Notifications",  # type: ignore[reportUnknownMemberType]
+                               "/org/freedesktop/Notifications",
+                               follow_name_owner_changes=True)
+            interface = dbus.Interface(obj, "org.freedesktop.Notifications")  # type: ignore[reportUnknownMemberType]
+
+            bus.add_signal_receiver(self._on_action_invoked, signal_name="ActionInvoked",  # type: ignore[reportUnknownMemberType]
+                                  dbus_interface="org.freedesktop.Notifications")
+            bus.add_signal_receiver(self._on_closed, signal_name="NotificationClosed",  # type: ignore[reportUnknownMemberType]
+                                  dbus_interface="org.freedesktop.Notifications")
+            self._interface = interface
+        return self._interface
+
+    def _on_action_invoked(self, nid: int, action_key: str) -> None:
+        callback = self._action_callbacks.get(int(nid), {}).get(str(action_key))
+        if callback:
+            callback()
+
+    def _on_closed(self, nid: int, reason: int) -> None:
+        self._action_callbacks.pop(int(nid), None)
 
     def notify(self, title: str, message: str, icon: str = "dialog-information",
                actions: Optional[List[Tuple[str, Callable[[], None]]]] = None,
@@ -24,14 +61,7 @@ class NotificationService:
             True if DBus notification succeeded, False otherwise
         """
         try:
-            import dbus  # type: ignore[import-untyped]
-            import dbus.mainloop.glib  # type: ignore[import-untyped]
-
-            dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)  # type: ignore[reportUnknownMemberType]
-            bus: dbus.SessionBus = dbus.SessionBus()  # type: ignore[reportUnknownMemberType]
-            obj = bus.get_object("org.freedesktop.Notifications",  # type: ignore[reportUnknownMemberType]
-                               "/org/freedesktop/Notifications")
-            interface = dbus.Interface(obj, "org.freedesktop.Notifications")  # type: ignore[reportUnknownMemberType]
+            interface = self._get_interface()
 
             action_list: List[str] = []
             action_callbacks: Dict[str, Callable[[], None]] = {}
@@ -42,16 +72,10 @@ class NotificationService:
                     action_list += [key, label]
                     action_callbacks[key] = callback
 
-            def on_action_invoked(nid: int, action_key: str) -> None:
-                if action_key in action_callbacks:
-                    action_callbacks[action_key]()
-
-            bus.add_signal_receiver(on_action_invoked, signal_name="ActionInvoked",  # type: ignore[reportUnknownMemberType]
-                                  dbus_interface="org.freedesktop.Notifications")
-            self._dbus_handler = on_action_invoked
-
-            interface.Notify("ScreenTracker", 0, icon, title, message,  # type: ignore[reportUnknownMemberType]
-                           action_list, {}, timeout)
+            nid = interface.Notify("ScreenTracker", 0, icon, title, message,  # type: ignore[attr-defined]
+                                   action_list, {}, timeout)
+            if action_callbacks:
+                self._action_callbacks[int(nid)] = action_callbacks
             return True
         except Exception as e:
             print(f"DBus notification failed: {e}")
@@ -1,43 +1,54 @@
 """Service for session-related calculations (single source of truth)."""
 import datetime
-from typing import Tuple, List, Dict, Any
+from itertools import islice
+from time import monotonic
+from typing import Tuple, List, Dict, Any, Optional
 from ..db.event_repository import EventRepository
 # --- MODIFIED: Import ActivityService ---
 from .activity_service import ActivityService
 
+# Session answers only matter to the second, so calls within one tray tick
+# (icon, popup labels, activity bar) share a single period scan
+SESSION_CACHE_TTL = 1.0
+
+SessionAndBreak = Tuple[
+    Tuple[datetime.datetime | None, float],
+    Tuple[datetime.datetime | None, datetime.datetime | None, float]
+]
+
 
 class SessionService:
     """Handles all session-related calculations by delegating to ActivityService."""
 
-    def __init__(self) -> None:
+    # Shared by every instance in the process: (expires at, latest event id, result)
+    _cached: Optional[Tuple[float, int, SessionAndBreak]] = None
+
+    def __init__(self, activity_service: Optional[ActivityService] = None) -> None:
         self.repo = EventRepository()
-        # --- MODIFIED: Create an ActivityService instance ---
-        self.activity_service = ActivityService()
+        # --- MODIFIED: Use the shared ActivityService when one is passed in ---
+        self.activity_service = activity_service or ActivityService()
 
     # --- MODIFIED: _build_recent_periods is REMOVED ---
     # We now call self.activity_service.get_detailed_activity_periods()
 
     def _get_periods_for_session(self) -> List[Dict[str, Any]]:
         """
-        Helper to get detailed periods, converting string timestamps to datetimes.
+        Helper to get detailed periods with datetime start/end values.
         """
-        # Call the consolidated method from ActivityService
-        periods_raw = self.activity_service.get_detailed_activity_periods(hours=24)
+        # Ask for datetimes directly rather than parsing ISO strings back;
+        # sessions never look at the raw events, so skip building them
+        periods = self.activity_service.get_detailed_activity_periods(
+            hours=24, iso=False, include_events=False
+        )
 
-        # Convert timestamps for internal use
-        for p in periods_raw:
-            p["start"] = datetime.datetime.fromisoformat(p["start"])
-            p["end"] = datetime.datetime.fromisoformat(p["end"])
+        for p in periods:
             p["duration"] = p["duration_sec"] # alias for consistency
 
-        return periods_raw
-
-    def get_current_session(self) -> Tuple[datetime.datetime | None, float]:
-        """
-        Get current active session start time and duration.
-        """
-        periods = self._get_periods_for_session()
+        return periods
 
+    @staticmethod
+    def _session_from(periods: List[Dict[str, Any]]) -> Tuple[datetime.datetime | None, float]:
+        """Current session (start, duration) from a list of periods."""
         # Last period is current state
         if not periods:
             return (None, 0.0)
@@ -49,17 +60,11 @@ class SessionService:
         else:
             return (None, 0.0)
 
-    def get_current_session_seconds(self) -> float:
-        """Get duration of current session in seconds."""
-        _, duration = self.get_current_session()
-        return duration
-
-    def get_last_break(self) -> Tuple[datetime.datetime | None, datetime.datetime | None, float]:
-        """
-        Get the last break period (inactive time).
-        """
-        periods = self._get_periods_for_session()
-
+    @staticmethod
+    def _break_from(
+        periods: List[Dict[str, Any]]
+    ) -> Tuple[datetime.datetime | None, datetime.datetime | None, float]:
+        """Last break (start, end, duration) from a list of periods."""
         if not periods:
             return (None, None, 0.0)
 
@@ -69,18 +74,59 @@ class SessionService:
         if current["state"] == "inactive":
             return (current["start"], None, current["duration"])
 
-        # Otherwise find last inactive period
-        for period in reversed(periods[:-1]):
+        # Otherwise find last inactive period, walking back from the one
+        # before current without copying the list
+        for period in islice(reversed(periods), 1, None):
             if period["state"] == "inactive":
                 return (period["start"], period["end"], period["duration"])
 
         return (None, None, 0.0)
 
+    def get_current_session(self) -> Tuple[datetime.datetime | None, float]:
+        """
+        Get current active session start time and duration.
+        """
+        return self.get_session_and_break()[0]
+
+    def get_current_session_seconds(self) -> float:
+        """Get duration of current session in seconds."""
+        _, duration = self.get_current_session()
+        return duration
+
+    def get_last_break(self) -> Tuple[datetime.datetime | None, datetime.datetime | None, float]:
+        """
+        Get the last break period (inactive time).
+        """
+        return self.get_session_and_break()[1]
+
     def get_last_break_seconds(self) -> float:
         """Get duration of last break in seconds."""
         _, _, duration = self.get_last_break()
         return duration
 
+    def get_session_and_break(self) -> SessionAndBreak:
+        """
+        Get the current session and the last break from a single period scan.
+
+        The result is reused for SESSION_CACHE_TTL seconds unless a new
+        event has been written in the meantime.
+        """
+        now = monotonic()
+        latest_id = self.repo.get_latest_id()
+        cached = SessionService._cached
+        if cached is not None and cached[0] > now and cached[1] == latest_id:
+            return cached[2]
+
+        periods = self._get_periods_for_session()
+        result = (self._session_from(periods), self._break_from(periods))
+        SessionService._cached = (now + SESSION_CACHE_TTL, latest_id, result)
+        return result
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget the shared session/break result."""
+        cls._cached = None
+
     def is_currently_active(self) -> bool:
         """Check if there's an active session right now."""
         _, duration = self.get_current_session()
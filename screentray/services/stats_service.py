@@ -1,17 +1,24 @@
 """Service for statistics aggregations."""
 import datetime
-from typing import Dict
-from ..config import IDLE_THRESHOLD_MS
-from .activity_service import ActivityService
+from typing import Dict, Optional, Tuple
+from ..db.event_repository import EventRepository
+from ..db.daily_totals_repository import DailyTotalsRepository
+from .activity_service import ActivityService, IDLE_THRESHOLD_SEC
 
-IDLE_THRESHOLD_SEC = IDLE_THRESHOLD_MS // 1000
+# Entries kept in the totals cache for yesterday (one per latest event id)
+TOTALS_CACHE_SIZE = 64
 
 
 class StatsService:
     """Handles statistics calculations for a given day."""
 
-    def __init__(self) -> None:
-        self.activity_service = ActivityService()
+    def __init__(self, activity_service: Optional[ActivityService] = None) -> None:
+        self.activity_service = activity_service or ActivityService()
+        self.repo = EventRepository()
+        self.daily_repo = DailyTotalsRepository()
+        # (day, latest event id) -> totals; only yesterday is cached here,
+        # older days are read from the daily_totals rollup
+        self._totals_cache: Dict[Tuple[str, int], Dict[str, float]] = {}
 
     def get_daily_totals(self, day: str) -> Dict[str, float]:
         """
@@ -21,16 +28,50 @@ class StatsService:
             Dict with 'active' and 'inactive' seconds
         """
         day_date = datetime.date.fromisoformat(day)
+        today = datetime.date.today()
+
+        # Today's totals grow with the clock, so they are always recomputed.
+        if day_date >= today:
+            return self._adjusted(*self._compute_daily_totals(day_date))
+
+        # Days before yesterday are settled: stored once, then read back
+        if day_date < today - datetime.timedelta(days=1):
+            stored = self.daily_repo.find_day(day_date)
+            if stored is None:
+                stored = self._compute_daily_totals(day_date)
+                self.daily_repo.save_day(day_date, *stored)
+            return self._adjusted(*stored)
+
+        # Yesterday can still receive backdated events, which move the latest id
+        key = (day, self.repo.get_latest_id())
+        cached = self._totals_cache.get(key)
+        if cached is None:
+            if len(self._totals_cache) >= TOTALS_CACHE_SIZE:
+                self._totals_cache.clear()
+            cached = self._adjusted(*self._compute_daily_totals(day_date))
+            self._totals_cache[key] = cached
+        return dict(cached)
+
+    @staticmethod
+    def _adjusted(active_sec: float, inactive_sec: float,
+                  short_idle_sec: float) -> Dict[str, float]:
+        """Totals with short inactive periods counted as active (minor pauses)."""
+        return {"active": active_sec + short_idle_sec,
+                "inactive": inactive_sec - short_idle_sec}
+
+    def _compute_daily_totals(self, day_date: datetime.date) -> Tuple[float, float, float]:
+        """(active, inactive, short inactive) seconds from a day's periods."""
         periods = self.activity_service.get_activity_periods_for_day(day_date)
 
-        totals: Dict[str, float] = {"active": 0.0, "inactive": 0.0}
+        active_sec = inactive_sec = short_idle_sec = 0.0
 
         for period in periods:
             duration = period["duration_seconds"]
-            # Short inactive periods count as active (minor pauses)
-            if period["state"] == "inactive" and duration < IDLE_THRESHOLD_SEC:
-                totals["active"] += duration
+            if period["state"] == "active":
+                active_sec += duration
             else:
-                totals[period["state"]] += duration
+                inactive_sec += duration
+                if duration < IDLE_THRESHOLD_SEC:
+                    short_idle_sec += duration
 
-        return totals
+        return active_sec, inactive_sec, short_idle_sec
@@ -3,8 +3,13 @@
 Background service to track user activity with event-driven plugin system.
 """
 import os
-import time
+import atexit
 import datetime
+import signal
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic
+from typing import TextIO, Tuple
 from ..config import (
     DB_PATH,
     LOG_INTERVAL,
@@ -12,9 +17,10 @@ from ..config import (
     DEBUG_MODE,
     DEBUG_LOG_PATH
 )
-from ..db import ensure_db_exists
+from ..db import ensure_db_exists, close_connection
 from ..db.event_repository import EventRepository
 from ..platform import get_platform
+from ..platform.x11 import get_x11, on_io_error
 from ..plugins import PluginManager
 
 
@@ -29,6 +35,10 @@ def is_screen_on() -> bool:
     """Delegate to platform implementation."""
     return platform.is_screen_on()
 
+def get_idle_and_screen_state() -> Tuple[float, bool]:
+    """Delegate to platform implementation (may probe both at once)."""
+    return platform.get_idle_and_screen_state()
+
 def get_active_window_info() -> str:
     """Delegate to platform implementation for debug logging."""
     info = platform.get_active_window_info()
@@ -39,16 +49,61 @@ def get_active_window_info() -> str:
         window_title = window_title[:47] + "..."
     return f"{app_name}: {window_title}"
 
+def wait_for_next_poll(interval: float) -> None:
+    """Delegate to platform implementation (may wake early on display changes)."""
+    platform.wait_for_activity(interval)
+
+def _stop_on_sigterm(signum: int, frame: object) -> None:
+    """Treat SIGTERM (systemd stop, logout) like Ctrl+C so shutdown runs."""
+    raise KeyboardInterrupt
+
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 IDLE_THRESHOLD_SEC = IDLE_THRESHOLD_MS / 1000.0
+POLL_LOG_INTERVAL = 60  # seconds between periodic 'poll' events
+MAX_POLL_INTERVAL = 30  # cap for the back-off while the screen is off
+
 
+# Debug log handle, opened on first use and kept open. It is line-buffered,
+# so every line reaches the file even if the tracker is killed or crashes
+_debug_file: TextIO | None = None
+_debug_lock = threading.Lock()  # window-info callbacks log from a worker thread
+_window_pool: ThreadPoolExecutor | None = None
 
-def debug_log(message: str) -> None:
+
+def debug_log(message: str, now: datetime.datetime | None = None) -> None:
     """Write debug message to log file if debug mode is enabled."""
+    global _debug_file
     if DEBUG_MODE:
-        timestamp = datetime.datetime.now().isoformat(timespec='milliseconds')
-        with open(DEBUG_LOG_PATH, 'a') as f:
-            f.write(f"[{timestamp}] {message}\n")
+        timestamp = (now or datetime.datetime.now()).isoformat(timespec='milliseconds')
+        with _debug_lock:
+            if _debug_file is None:
+                _debug_file = open(DEBUG_LOG_PATH, 'a', buffering=1)
+                atexit.register(_debug_file.close)
+            _debug_file.write(f"[{timestamp}] {message}\n")
+
+
+def debug_log_with_window(message: str, now: datetime.datetime) -> None:
+    """
+    Debug-log message with the active window appended.
+
+    Over the X connection the lookup is a few round trips and is done
+    inline (the connection is not shared across threads). The xdotool
+    fallback forks a process, so it runs on a worker thread and the line
+    is written when it finishes, keeping the loop's timing unaffected.
+    """
+    global _window_pool
+    if get_x11() is not None:
+        debug_log(f"{message} | Window: {get_active_window_info()}", now)
+        return
+
+    if _window_pool is None:
+        _window_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="window-info")
+
+    def _log(future: "Future[str]") -> None:
+        window_info = future.result() if future.exception() is None else "unknown"
+        debug_log(f"{message} | Window: {window_info}", now)
+
+    _window_pool.submit(get_active_window_info).add_done_callback(_log)
 
 
 def main() -> None:
@@ -56,147 +111,193 @@ def main() -> None:
     ensure_db_exists()
     repo = EventRepository()
 
-    # Initialize plugin system
+    # Initialize plugin system (install, wire up, register events, start)
     plugin_manager = PluginManager()
     plugin_manager.discover_plugins()
-    plugin_manager.install_all()
-    plugin_manager.set_plugin_manager_for_all()
+    plugin_manager.initialize()
+
+    # Only plugins with a poll() hook need the base rate while active
+    poll_hooks = plugin_manager.poll_hooks
 
-    # Register plugin event handlers
-    for plugin in plugin_manager.plugins.values():
-        try:
-            plugin.register_events(plugin_manager)
-        except Exception as e:
-            print(f"Error registering events for {plugin.get_info()['name']}: {e}")
+    # Open the X connection up front so every poll reuses the same socket
+    # instead of forking xprintidle/xset
+    x11_backend = "X11 connection" if get_x11() is not None else "subprocess tools"
 
-    plugin_manager.start_all()
+    # Resolve per-iteration lookups once
+    _now = datetime.datetime.now
+    idle_threshold = IDLE_THRESHOLD_SEC
+    threshold_label = f"{idle_threshold}s"
 
-    # Track state
+    # Track state; interval math uses the monotonic clock, wall-clock time
+    # is only read when an event or log line needs a timestamp
     current_state = "unknown"
-    last_poll_log = datetime.datetime.now()
-    last_idle_change_time = datetime.datetime.now()
+    last_poll_log = monotonic()
+    last_idle_change_time = last_poll_log
     last_idle_value = 0.0
+    unchanged_polls = 0  # consecutive inactive polls without a state change
 
     if DEBUG_MODE:
         debug_log("="*80)
         debug_log("ScreenTracker started in DEBUG mode")
-        debug_log(f"IDLE_THRESHOLD_SEC: {IDLE_THRESHOLD_SEC}")
+        debug_log(f"IDLE_THRESHOLD_SEC: {idle_threshold}")
         debug_log(f"LOG_INTERVAL: {LOG_INTERVAL}")
+        debug_log(f"Idle/screen backend: {x11_backend}")
         debug_log("="*80)
 
-    repo.insert("tracker_start")
-    print(f"[{datetime.datetime.now().isoformat(timespec='seconds')}] tracker_start")
-    print("Starting tracker main loop...")
+    now = _now()
+    now_iso = now.isoformat(timespec='seconds')
+    repo.insert("tracker_start", timestamp=now)
+    print(f"[{now_iso}] tracker_start")
+    print(f"Starting tracker main loop (idle/screen via {x11_backend})...")
     if DEBUG_MODE:
         print(f"Debug logging enabled: {DEBUG_LOG_PATH}")
 
+    signal.signal(signal.SIGTERM, _stop_on_sigterm)
+
+    def record_stop() -> None:
+        """Write queued events and tracker_stop, then close the database."""
+        on_io_error(None)
+        repo.flush()
+        now = _now()
+        repo.insert("tracker_stop", timestamp=now)
+        print(f"[{now.isoformat(timespec='seconds')}] tracker_stop")
+        close_connection()
+
+    # Losing the X connection (logout, server crash) ends the process from
+    # inside Xlib, so the stop has to be recorded there
+    on_io_error(record_stop)
+
     try:
         while True:
-            now = datetime.datetime.now()
-            idle_sec = get_idle_seconds()
-            screen_on = is_screen_on()
+            tick = monotonic()
+            idle_sec, screen_on = get_idle_and_screen_state()
+
+            # Determine actual state
+            if screen_on and idle_sec < idle_threshold:
+                new_state = "active"
+            else:
+                new_state = "inactive"
+
+            # Read the wall clock and format the shared labels once per
+            # iteration, and only when something will be logged (debug
+            # output, a transition or a poll log)
+            log_due = tick - last_poll_log >= POLL_LOG_INTERVAL
+            if DEBUG_MODE or new_state != current_state or log_due:
+                now = _now()
+                now_iso = now.isoformat(timespec='seconds')
+                screen_label = 'on' if screen_on else 'off'
 
             # Debug: Track idle changes
             if DEBUG_MODE:
                 if idle_sec < last_idle_value:
-                    time_since_last_change = (now - last_idle_change_time).total_seconds()
-                    window_info = get_active_window_info()
-                    debug_log(
+                    time_since_last_change = tick - last_idle_change_time
+                    debug_log_with_window(
                         f"IDLE RESET: {last_idle_value:.1f}s -> {idle_sec:.1f}s "
-                        f"(after {time_since_last_change:.1f}s) | Window: {window_info}"
+                        f"(after {time_since_last_change:.1f}s)",
+                        now
                     )
-                    last_idle_change_time = now
+                    last_idle_change_time = tick
 
                 elif idle_sec - last_idle_value > 5.0:
                     debug_log(
                         f"IDLE INCREASE: {last_idle_value:.1f}s -> {idle_sec:.1f}s "
-                        f"(+{idle_sec - last_idle_value:.1f}s)"
+                        f"(+{idle_sec - last_idle_value:.1f}s)",
+                        now
                     )
 
                 last_idle_value = idle_sec
 
-            # Determine actual state
-            if screen_on and idle_sec < IDLE_THRESHOLD_SEC:
-                new_state = "active"
-            else:
-                new_state = "inactive"
-
             if DEBUG_MODE and new_state == "active":
-                window_info = get_active_window_info()
-                debug_log(
+                debug_log_with_window(
                     f"STATE: {new_state} | idle={idle_sec:.1f}s | "
-                    f"screen={'on' if screen_on else 'off'} | Window: {window_info}"
+                    f"screen={screen_label}",
+                    now
                 )
 
             if current_state == "unknown":
                 current_state = new_state
 
                 if DEBUG_MODE:
-                    debug_log(f"Initial state established: {new_state}")
+                    debug_log(f"Initial state established: {new_state}", now)
 
                 if new_state == "active":
                     plugin_manager.notify_active()
-                    detail = f"state={new_state} idle={idle_sec:.0f}s screen={'on' if screen_on else 'off'}"
-                    repo.insert("poll", detail)
-                    print(f"[{now.isoformat(timespec='seconds')}] poll (initial): {detail}")
-                    last_poll_log = now
+                    detail = f"state={new_state} idle={idle_sec:.0f}s screen={screen_label}"
+                    repo.insert_async("poll", detail, timestamp=now)
+                    print(f"[{now_iso}] poll (initial): {detail}")
+                    last_poll_log = tick
 
-                time.sleep(LOG_INTERVAL)
+                wait_for_next_poll(LOG_INTERVAL)
                 continue
 
             # Log state transitions
             if new_state != current_state:
                 if DEBUG_MODE:
-                    debug_log(f"STATE CHANGE: {current_state} -> {new_state}")
+                    debug_log(f"STATE CHANGE: {current_state} -> {new_state}", now)
 
                 if new_state == "active":
-                    repo.insert("idle_end", f"idle was {idle_sec:.0f}s")
-                    print(f"[{now.isoformat(timespec='seconds')}] idle_end (idle was {idle_sec:.0f}s)")
+                    repo.insert("idle_end", f"idle was {idle_sec:.0f}s", timestamp=now)
+                    print(f"[{now_iso}] idle_end (idle was {idle_sec:.0f}s)")
                     plugin_manager.notify_active()
                 else:
                     if not screen_on:
-                        repo.insert("screen_off")
-                        print(f"[{now.isoformat(timespec='seconds')}] screen_off")
+                        repo.insert("screen_off", timestamp=now)
+                        print(f"[{now_iso}] screen_off")
                         if DEBUG_MODE:
-                            debug_log("Inactive reason: screen off")
+                            debug_log("Inactive reason: screen off", now)
                     else:
-                        idle_start_time = now - datetime.timedelta(seconds=idle_sec - IDLE_THRESHOLD_SEC)
-                        repo.insert("idle_start", f"idle {idle_sec:.0f}s > {IDLE_THRESHOLD_SEC}s",
-                                  timestamp=idle_start_time)
+                        idle_start_time = now - datetime.timedelta(seconds=idle_sec - idle_threshold)
+                        repo.insert("idle_start", f"idle {idle_sec:.0f}s > {threshold_label}",
+                            timestamp=idle_start_time)
                         print(f"[{idle_start_time.isoformat(timespec='seconds')}] idle_start (idle {idle_sec:.0f}s)")
                         if DEBUG_MODE:
-                            debug_log(f"Inactive reason: idle threshold exceeded ({idle_sec:.0f}s > {IDLE_THRESHOLD_SEC}s)")
+                            debug_log(f"Inactive reason: idle threshold exceeded ({idle_sec:.0f}s > {threshold_label})", now)
 
                     plugin_manager.notify_inactive()
 
             # Poll plugins (only if active)
             if new_state == "active":
-                for plugin in plugin_manager.plugins.values():
-                    if hasattr(plugin, 'poll'):
-                        try:
-                            plugin.poll()  # type: ignore
-                        except Exception as e:
-                            print(f"Plugin poll error: {e}")
-                            if DEBUG_MODE:
-                                debug_log(f"Plugin poll error: {e}")
-
-            # Log polling data periodically (every 60s)
-            if (now - last_poll_log).total_seconds() >= 60:
-                detail = f"state={new_state} idle={idle_sec:.0f}s screen={'on' if screen_on else 'off'}"
-                repo.insert("poll", detail)
-                print(f"[{now.isoformat(timespec='seconds')}] poll: {detail}")
-                last_poll_log = now
+                for poll in poll_hooks:
+                    try:
+                        poll()
+                    except Exception as e:
+                        print(f"Plugin poll error: {e}")
+                        if DEBUG_MODE:
+                            debug_log(f"Plugin poll error: {e}", now)
+
+            # Log polling data periodically
+            if log_due:
+                detail = f"state={new_state} idle={idle_sec:.0f}s screen={screen_label}"
+                repo.insert_async("poll", detail, timestamp=now)
+                print(f"[{now_iso}] poll: {detail}")
+                last_poll_log = tick
+
+            # While the screen is off, back off exponentially up to
+            # MAX_POLL_INTERVAL; the screensaver event that turns it back on
+            # wakes us at once. Input does not, so while idle with the screen
+            # on the base rate is kept and a return is stamped on time.
+            # While active the base rate is kept too: a DPMS power-off (lid,
+            # power manager, 'xset dpms force off') sends no event, so a
+            # longer wait would stamp screen_off late and count it as active
+            if new_state == "active":
+                unchanged_polls = 0
+                interval = LOG_INTERVAL
+            elif new_state != current_state or screen_on:
+                unchanged_polls = 0
+                interval = LOG_INTERVAL
+            else:
+                unchanged_polls += 1
+                interval = min(MAX_POLL_INTERVAL, LOG_INTERVAL * (1 << min(unchanged_polls, 5)))
 
             current_state = new_state
-            time.sleep(LOG_INTERVAL)
+            wait_for_next_poll(interval)
 
     except KeyboardInterrupt:
         print("\nTracker stopping.")
         if DEBUG_MODE:
-            debug_log("Tracker stopped by user (KeyboardInterrupt)")
+            debug_log("Tracker stopped (KeyboardInterrupt or SIGTERM)")
         plugin_manager.stop_all()
-        repo.insert("tracker_stop")
-        print(f"[{datetime.datetime.now().isoformat(timespec='seconds')}] tracker_stop")
+        record_stop()
 
 
 if __name__ == "__main__":
@@ -3,7 +3,7 @@ from PyQt5.QtWidgets import QWidget
 from PyQt5.QtGui import QPainter, QColor, QPaintEvent
 # from PyQt5.QtCore import Qt
 import datetime
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 from ..services.activity_service import ActivityService
 from ..services.session_service import SessionService
 from ..config import settings
@@ -12,17 +12,22 @@ from ..config import settings
 class ActivityBar(QWidget):
     """Visual 24h rolling activity bar with session overlay."""
 
-    def __init__(self) -> None:
+    def __init__(self, activity_service: Optional[ActivityService] = None,
+                 session_service: Optional[SessionService] = None) -> None:
         super().__init__()
         self.setFixedHeight(20)
-        self.activity_service = ActivityService()
-        self.session_service = SessionService()
+        self.activity_service = activity_service or ActivityService()
+        self.session_service = session_service or SessionService(self.activity_service)
         self.periods: List[Dict[str, Any]] = []
+        self.session_start: datetime.datetime | None = None
+        self.session_duration: float = 0.0
         self.setMouseTracking(True)
 
     def update_data(self) -> None:
         """Refresh activity data from service."""
         self.periods = self.activity_service.get_activity_periods_last_24h()
+        # Queried here rather than in paintEvent, which Qt may call many times
+        self.session_start, self.session_duration = self.session_service.get_current_session()
         self.update()
 
     def paintEvent(self, a0: QPaintEvent | None = None) -> None:
@@ -33,6 +38,8 @@ class ActivityBar(QWidget):
         width = self.width()
         height = self.height()
         total_seconds = 24 * 3600
+        now = datetime.datetime.now()
+        window_start = now - datetime.timedelta(hours=24)
 
         # Draw activity periods
         for period in self.periods:
@@ -41,9 +48,6 @@ class ActivityBar(QWidget):
             state = period["state"]
 
             # Calculate relative position in 24h window
-            now = datetime.datetime.now()
-            window_start = now - datetime.timedelta(hours=24)
-
             start_offset = (start - window_start).total_seconds()
             end_offset = (end - window_start).total_seconds()
 
@@ -55,11 +59,8 @@ class ActivityBar(QWidget):
             painter.fillRect(x, 0, w, height, color)
 
         # Draw current session overlay
-        session_start, session_duration = self.session_service.get_current_session()
+        session_start, session_duration = self.session_start, self.session_duration
         if session_start and session_duration > 0:
-            now = datetime.datetime.now()
-            window_start = now - datetime.timedelta(hours=24)
-
             if session_start >= window_start:
                 start_offset = (session_start - window_start).total_seconds()
                 session_x = int((start_offset / total_seconds) * width)
@@ -2,10 +2,10 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QTabWidget
 )
-from PyQt5.QtGui import QShowEvent
+from PyQt5.QtGui import QHideEvent, QShowEvent
 from PyQt5.QtCore import QTimer, Qt, QEvent
 import datetime
-from typing import List
+from typing import List, Optional
 from .activity_bar import ActivityBar
 from ..services.stats_service import StatsService
 from ..services.session_service import SessionService
@@ -13,6 +13,17 @@ from ..plugins import PluginManager
 from ..events import Event, PopupReadyContext
 
 
+def format_duration(seconds: float) -> str:
+    """Format seconds as 'Xh Ym Zs', dropping leading zero units."""
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
+    if h:
+        return f"{h}h {m}m {s}s"
+    if m:
+        return f"{m}m {s}s"
+    return f"{s}s"
+
+
 class StatsPopup(QWidget):
     """
     Statistics popup
@@ -21,11 +32,15 @@ class StatsPopup(QWidget):
     coupling core to plugin implementations.
     """
 
-    def __init__(self, plugin_manager: PluginManager) -> None:
+    def __init__(self, plugin_manager: PluginManager,
+                 session_service: Optional[SessionService] = None) -> None:
         super().__init__()
         self.date = datetime.date.today()
-        self.stats_service = StatsService()
-        self.session_service = SessionService()
+        # One ActivityService behind every view of the popup and, when the
+        # tray passes its SessionService in, behind the tray icon as well
+        self.session_service = session_service or SessionService()
+        self.activity_service = self.session_service.activity_service
+        self.stats_service = StatsService(self.activity_service)
         self.plugin_manager = plugin_manager
 
         # Configure as native popup window
@@ -64,10 +79,10 @@ class StatsPopup(QWidget):
             PopupReadyContext(popup=self, layout=self.main_layout)
         )
 
-        # Update timer
+        # Update timer; only runs while the popup is visible (see showEvent/hideEvent)
         self.timer = QTimer(self)
+        self.timer.setInterval(5000)
         self.timer.timeout.connect(self.update_all_stats)
-        self.timer.start(5000)
 
         self.update_all_stats()
 
@@ -87,7 +102,7 @@ class StatsPopup(QWidget):
         now_layout.addSpacing(15)
 
         now_layout.addWidget(QLabel("<b>Last 24h Activity:</b>"))
-        self.activity_bar = ActivityBar()
+        self.activity_bar = ActivityBar(self.activity_service, self.session_service)
         now_layout.addWidget(self.activity_bar)
 
         now_layout.addStretch()
@@ -139,36 +154,31 @@ class StatsPopup(QWidget):
         """Update live statistics on 'Now' tab."""
         self.activity_bar.update_data()
 
-        is_active = self.session_service.is_currently_active()
+        (_, session_s), (_, break_end, break_s) = self.session_service.get_session_and_break()
 
-        if is_active:
-            _, session_s = self.session_service.get_current_session()
-            _, break_end, break_s = self.session_service.get_last_break()
-
-            self.session_label.setText(f"Session: {self._format_seconds(session_s)}")
+        if session_s > 0:
+            self._set_text(self.session_label, f"Session: {self._format_seconds(session_s)}")
             if break_end:
-                self.break_label.setText(f"Last Break: {self._format_seconds(break_s)}")
+                self._set_text(self.break_label, f"Last Break: {self._format_seconds(break_s)}")
             else:
-                self.break_label.setText("Last Break: (no recent break)")
+                self._set_text(self.break_label, "Last Break: (no recent break)")
         else:
-            _, break_end, break_s = self.session_service.get_last_break()
-
             if break_end is None:
-                self.session_label.setText("Session: Idle")
-                self.break_label.setText(f"Idle Duration: {self._format_seconds(break_s)}")
+                self._set_text(self.session_label, "Session: Idle")
+                self._set_text(self.break_label, f"Idle Duration: {self._format_seconds(break_s)}")
             else:
-                self.session_label.setText("Session: No active session")
-                self.break_label.setText(f"Last Break: {self._format_seconds(break_s)}")
+                self._set_text(self.session_label, "Session: No active session")
+                self._set_text(self.break_label, f"Last Break: {self._format_seconds(break_s)}")
 
     def update_historical_stats(self) -> None:
         """Update historical statistics on 'Daily Stats' tab."""
-        self.date_label.setText(f"<b>{self.date.isoformat()}</b>")
+        self._set_text(self.date_label, f"<b>{self.date.isoformat()}</b>")
         self.next_button.setEnabled(self.date < datetime.date.today())
 
         day_str = self.date.isoformat()
         totals = self.stats_service.get_daily_totals(day_str)
-        self.active_label.setText(f"Active: {self._format_seconds(totals['active'])}")
-        self.inactive_label.setText(f"Inactive: {self._format_seconds(totals['inactive'])}")
+        self._set_text(self.active_label, f"Active: {self._format_seconds(totals['active'])}")
+        self._set_text(self.inactive_label, f"Inactive: {self._format_seconds(totals['inactive'])}")
 
         # Update legacy plugin widgets
         for widget in self.plugin_widgets:
@@ -188,23 +198,26 @@ class StatsPopup(QWidget):
 
     def _format_seconds(self, seconds: float) -> str:
         """Format seconds into human-readable duration."""
-        total_s = int(seconds)
-        h = total_s // 3600
-        m = (total_s % 3600) // 60
-        s = total_s % 60
-        if h > 0:
-            return f"{h}h {m}m {s}s"
-        elif m > 0:
-            return f"{m}m {s}s"
-        else:
-            return f"{s}s"
+        return format_duration(seconds)
+
+    @staticmethod
+    def _set_text(label: QLabel, text: str) -> None:
+        """Set label text only when it changed, avoiding needless relayouts."""
+        if label.text() != text:
+            label.setText(text)
 
     def showEvent(self, a0: QShowEvent | None) -> None:
-        """Reset to today and refresh on show."""
+        """Reset to today, refresh and resume live updates on show."""
         self.date = datetime.date.today()
         self.update_all_stats()
+        self.timer.start()
         super().showEvent(a0)
 
+    def hideEvent(self, a0: QHideEvent | None) -> None:
+        """Stop live updates while hidden."""
+        self.timer.stop()
+        super().hideEvent(a0)
+
     def event(self, a0: QEvent|None) -> bool:
         """Auto-hide on focus loss."""
         if a0 and a0.type() == QEvent.WindowDeactivate: # pyright: ignore[reportUnknownMemberType, reportAttributeAccessIssue]
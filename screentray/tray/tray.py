@@ -7,10 +7,11 @@ from ..services.system_service import SystemService
 from PyQt5.QtWidgets import QSystemTrayIcon, QMenu, QApplication
 from PyQt5.QtGui import QIcon, QPainter, QColor, QPixmap, QCursor, QPalette
 from PyQt5.QtCore import (
-    QTimer, Qt, QPropertyAnimation, QEasingCurve, QObject, pyqtProperty, pyqtSignal, QRect # type: ignore
+    QTimer, Qt, QPropertyAnimation, QEasingCurve, QObject, pyqtProperty, pyqtSignal, QRect, # type: ignore
+    QFileSystemWatcher
 )
 from .popup import StatsPopup
-from ..config import ICON_PULSE_INTERVAL, settings, NOTIFY_BUTTONS
+from ..config import ICON_PULSE_INTERVAL, TRAY_UPDATE_INTERVAL, settings, NOTIFY_BUTTONS
 from ..services.session_service import SessionService
 from ..events import Event, TrayReadyContext
 from ..plugins import PluginManager
@@ -92,8 +93,13 @@ class TrayIconVisuals(QObject):
         self.animation.setEasingCurve(QEasingCurve.InBounce) # pyright: ignore[reportUnknownArgumentType, reportUnknownMemberType]
         self.animation.valueChanged.connect(self._emit_animated_icon)
 
+        # Theme icons by name and colored icons by (name, rgba); the pulse
+        # animation revisits the same few hundred colors every loop
+        self._theme_icon_cache: Dict[str, QIcon] = {}
+        self._colored_icon_cache: Dict[Tuple[str, int], QIcon] = {}
+
         # Initialize with the base idle icon
-        self.icon_updated.emit(QIcon.fromTheme(ICON_NORMAL))
+        self.icon_updated.emit(self._get_theme_icon(ICON_NORMAL))
 
     def _emit_animated_icon(self, color: QColor) -> None:
         """Slot called by animation. Emits the icon based on the current state."""
@@ -101,13 +107,25 @@ class TrayIconVisuals(QObject):
         icon_name: str = _STATE_CONFIG.get(self.current_state, {}).get("icon", ICON_NORMAL)
         self.icon_updated.emit(self._create_colored_icon(icon_name, color))
 
+    def _get_theme_icon(self, icon_name: str) -> QIcon:
+        """Looks up a theme icon once per name."""
+        icon = self._theme_icon_cache.get(icon_name)
+        if icon is None:
+            icon = self._theme_icon_cache[icon_name] = QIcon.fromTheme(icon_name)
+        return icon
+
     def _create_colored_icon(self, icon_name: str, color: QColor) -> QIcon:
-        """Creates a colored version of the KDE icon."""
+        """Creates a colored version of the KDE icon, once per name and color."""
+        key = (icon_name, color.rgba())
+        cached = self._colored_icon_cache.get(key)
+        if cached is not None:
+            return cached
+
         pixmap: QPixmap = QPixmap(16, 16)
         pixmap.fill(Qt.transparent) # pyright: ignore[reportAttributeAccessIssue, reportUnknownArgumentType, reportUnknownMemberType]
 
         # Load the original icon from the theme
-        original_icon: QIcon = QIcon.fromTheme(icon_name)
+        original_icon: QIcon = self._get_theme_icon(icon_name)
         painter: QPainter = QPainter(pixmap)
 
         # Draw the original icon onto the pixmap
@@ -118,7 +136,8 @@ class TrayIconVisuals(QObject):
         painter.fillRect(pixmap.rect(), color)
         painter.end()
 
-        return QIcon(pixmap)
+        icon = self._colored_icon_cache[key] = QIcon(pixmap)
+        return icon
 
     def _get_theme_highlight_color(self) -> QColor:
         """Helper to safely get the theme's highlight color."""
@@ -154,7 +173,7 @@ class TrayIconVisuals(QObject):
 
         else:
             # 3. Native Themed Icon (idle/active)
-            self.icon_updated.emit(QIcon.fromTheme(config["icon"]))
+            self.icon_updated.emit(self._get_theme_icon(config["icon"]))
 
     def get_static_icon(self, state: str) -> QIcon:
         """
@@ -168,7 +187,7 @@ class TrayIconVisuals(QObject):
             return self._create_colored_icon(config["icon"], config["static_color"])
 
         # Return the native themed icon for idle/active states
-        return QIcon.fromTheme(config["icon"])
+        return self._get_theme_icon(config["icon"])
 
 class TrayApp:
     """
@@ -182,7 +201,6 @@ class TrayApp:
         self.session_service = SessionService()
         self.notified_threshold = False
         self.snooze_until: Optional[datetime.datetime] = None
-        self._dbus_signal_handler: Optional[Callable[[int, str], None]] = None
 
         # Initialize plugin system for UI process
         self.plugin_manager = PluginManager()
@@ -190,13 +208,9 @@ class TrayApp:
         self.plugin_manager.set_plugin_manager_for_all()
 
         # Register plugin event handlers
-        for plugin in self.plugin_manager.plugins.values():
-            try:
-                plugin.register_events(self.plugin_manager)
-            except Exception as e:
-                print(f"Error registering events for plugin: {e}")
+        self.plugin_manager.register_events_for_all()
 
-        self.popup: StatsPopup = StatsPopup(self.plugin_manager)
+        self.popup: StatsPopup = StatsPopup(self.plugin_manager, self.session_service)
 
         self.visuals = TrayIconVisuals()
 
@@ -220,7 +234,15 @@ class TrayApp:
         # Timer for updates
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_status)  # pyright: ignore[reportGeneralTypeIssues]
-        self.timer.start(2000)
+        self.timer.start(TRAY_UPDATE_INTERVAL)
+
+        # Test notifications are requested by creating the trigger file;
+        # watch its directory instead of checking for the file every tick
+        trigger_dir = os.path.dirname(TEST_NOTIFICATION_TRIGGER)
+        os.makedirs(trigger_dir, exist_ok=True)
+        self._trigger_watcher = QFileSystemWatcher([trigger_dir])
+        self._trigger_watcher.directoryChanged.connect(self.on_trigger_dir_changed)  # pyright: ignore[reportGeneralTypeIssues]
+        self.on_trigger_dir_changed()
 
         self.update_status()
         self.tray_icon.show()
@@ -314,6 +336,12 @@ class TrayApp:
         elif reason == QSystemTrayIcon.ActivationReason.Context:
             self.menu.popup(QCursor.pos())
 
+    def on_trigger_dir_changed(self, _path: str = "") -> None:
+        """Send a test notification if the trigger file has appeared."""
+        if os.path.exists(TEST_NOTIFICATION_TRIGGER):
+            os.remove(TEST_NOTIFICATION_TRIGGER)
+            self.send_test_notification()
+
     def on_notification_clicked(self) -> None:
         """Handle notification click."""
         self.menu.popup(QCursor.pos())
@@ -326,19 +354,12 @@ class TrayApp:
 
     def update_status(self) -> None:
         """Update tray icon and tooltip based on activity."""
-        # Check for test notification trigger
-        if os.path.exists(TEST_NOTIFICATION_TRIGGER):
-            os.remove(TEST_NOTIFICATION_TRIGGER)
-            self.send_test_notification()
-            return
-
-        is_active = self.session_service.is_currently_active()
+        # One period scan answers both the session and the break
+        (_, session_s), (_, break_end, break_s) = self.session_service.get_session_and_break()
+        is_active = session_s > 0
         is_snoozing = self.is_snoozed()
 
         if is_active:
-            _, session_s = self.session_service.get_current_session()
-            _, break_end, break_s = self.session_service.get_last_break()
-
             session_m = session_s / 60.0
             tooltip = f"Active: {int(session_m)}m"
 
@@ -364,7 +385,6 @@ class TrayApp:
                 # No need to reset snooze_until here, only when we become inactive
 
         else:  # Not active (idle)
-            _, break_end, break_s = self.session_service.get_last_break()
             if break_end is None:
                 tooltip = f"Idle: {int(break_s / 60)}m"
             else:
@@ -374,7 +394,10 @@ class TrayApp:
             self.notified_threshold = False
             self.snooze_until = None  # Reset snooze when idle
 
-        self.tray_icon.setToolTip(tooltip)
+        # The tooltip text only moves once a minute; an unchanged setToolTip
+        # would still send a NewToolTip signal to the status notifier host
+        if self.tray_icon.toolTip() != tooltip:
+            self.tray_icon.setToolTip(tooltip)
 
     def notify_threshold(self) -> None:
         """Show desktop notification when threshold exceeded."""
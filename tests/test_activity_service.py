@@ -1,7 +1,12 @@
 """Unit tests for ActivityService."""
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 import datetime
+from screentray.db import connection
+from screentray.db.daily_totals_repository import DailyTotalsRepository
+from screentray.db.event_repository import EventRepository
 from screentray.services.activity_service import ActivityService
 from screentray.models import Event
 
@@ -11,6 +16,7 @@ class TestActivityService(unittest.TestCase):
 
     def setUp(self) -> None:
         """Set up test fixtures."""
+        ActivityService.clear_cache()
         self.service = ActivityService()
         # Use current time relative to the system to ensure service lookups (which use datetime.now())
         # find these events. We place base_time 1 hour ago.
@@ -49,6 +55,18 @@ class TestActivityService(unittest.TestCase):
         self.assertEqual(periods[0]["state"], "active")
         self.assertEqual(periods[0]["duration_seconds"], 600.0)
 
+    def test_periods_end_at_given_now(self) -> None:
+        """A caller-supplied now clips the final period instead of the clock."""
+        events = [self._create_event(0, "screen_on")]
+        start = self.base_time
+        end = start + datetime.timedelta(minutes=10)
+        now = start + datetime.timedelta(minutes=4)
+
+        periods = self.service._build_simple_periods(events, start, end, now=now) # pyright: ignore[reportPrivateUsage]
+
+        self.assertEqual(periods[-1]["end"], now)
+        self.assertEqual(periods[-1]["duration_seconds"], 240.0)
+
     def test_active_to_inactive_transition(self) -> None:
         """screen_on followed by idle_start creates two periods."""
         events = [
@@ -134,6 +152,7 @@ class TestActivityService(unittest.TestCase):
             service = ActivityService()
             service.repo = mock_repo_class.return_value # pyright: ignore[reportUnknownMemberType, reportAttributeAccessIssue]
             service.repo.find_events_in_period.return_value = events # pyright: ignore[reportUnknownMemberType]
+            service.repo.get_latest_timestamp.return_value = events[-1].timestamp # pyright: ignore[reportUnknownMemberType]
 
             # Look back 2 hours to ensure we capture our events (base_time is -1h)
             periods = service.get_detailed_activity_periods(hours=2)
@@ -159,8 +178,10 @@ class TestActivityService(unittest.TestCase):
             service = ActivityService()
             service.repo = mock_repo_class.return_value # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType]
             service.repo.find_events_in_period.return_value = events # pyright: ignore[reportUnknownMemberType]
+            service.repo.get_latest_timestamp.return_value = events[-1].timestamp # pyright: ignore[reportUnknownMemberType]
 
-            periods = service.get_detailed_activity_periods(hours=1)
+            # Look back 2 hours so the idle_end at base_time (-1h) is inside the window
+            periods = service.get_detailed_activity_periods(hours=2)
 
         active_period = periods[1]
         self.assertEqual(active_period["state"], "active")
@@ -168,6 +189,185 @@ class TestActivityService(unittest.TestCase):
 
         self.skipTest('Test is incomplete')
 
+    @patch('screentray.services.activity_service.EventRepository')
+    def test_detailed_periods_without_events_keep_bounds(self, mock_repo_class: object) -> None:
+        """include_events=False yields the same periods with no raw events."""
+        events = [
+            self._create_event(0, "screen_on"),
+            self._create_event(60, "poll", "state=active"),
+            self._create_event(760, "screen_on"),
+            self._create_event(900, "idle_start")
+        ]
+
+        with patch.object(ActivityService, '__init__', lambda x: None):
+            service = ActivityService()
+            service.repo = mock_repo_class.return_value # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType]
+            service.repo.find_events_in_period.return_value = events # pyright: ignore[reportUnknownMemberType]
+            service.repo.get_latest_timestamp.return_value = events[-1].timestamp # pyright: ignore[reportUnknownMemberType]
+
+            full = service.get_detailed_activity_periods(hours=2, iso=False)
+            bare = service.get_detailed_activity_periods(hours=2, iso=False, include_events=False)
+
+        def bounds(periods: list[dict[str, object]]) -> list[tuple[object, ...]]:
+            return [(p["start"], p["state"], p["duration_sec"]) for p in periods]
+
+        # First and last periods run from and to the clock, read per call
+        self.assertEqual(bounds(bare[1:-1]), bounds(full[1:-1]))
+        self.assertTrue(all(p["events"] == [] for p in bare))
+
+    @patch('screentray.services.activity_service.EventRepository')
+    def test_detailed_periods_skip_scan_without_recent_events(self, mock_repo_class: object) -> None:
+        """Newest event before the window = one inactive period, no range query."""
+        with patch.object(ActivityService, '__init__', lambda x: None):
+            service = ActivityService()
+            service.repo = mock_repo_class.return_value # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType]
+            service.repo.get_latest_timestamp.return_value = "2000-01-01T00:00:00" # pyright: ignore[reportUnknownMemberType]
+
+            periods = service.get_detailed_activity_periods(hours=2)
+
+        self.assertEqual(len(periods), 1)
+        self.assertEqual(periods[0]["state"], "inactive")
+        service.repo.find_events_in_period.assert_not_called() # pyright: ignore[reportUnknownMemberType]
+
+
+class TestDailyTotalsRollup(unittest.TestCase):
+    """Test that completed days are served from the daily_totals rollup."""
+
+    def setUp(self) -> None:
+        """Point the connection layer at a fresh database."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path_patcher = patch.object(
+            connection, 'DB_PATH', os.path.join(self.tmpdir.name, "test.db")
+        )
+        self.path_patcher.start()
+        connection.ensure_db_exists()
+        ActivityService.clear_cache()
+        self.service = ActivityService()
+
+    def tearDown(self) -> None:
+        connection.close_connection()
+        self.path_patcher.stop()
+        self.tmpdir.cleanup()
+
+    def test_settled_days_computed_once(self) -> None:
+        """Old days are stored after the first request; recent days stay live."""
+        today = datetime.date.today()
+        start = today - datetime.timedelta(days=4)
+
+        with patch.object(self.service, '_day_state_changes',
+                          wraps=self.service._day_state_changes) as periods: # pyright: ignore[reportPrivateUsage]
+            first = self.service.get_daily_totals_range(start, today)
+            self.assertEqual(periods.call_count, 5)
+
+            periods.reset_mock()
+            second = self.service.get_daily_totals_range(start, today)
+
+            # Only yesterday and today are recomputed
+            self.assertEqual(periods.call_count, 2)
+
+        self.assertEqual([d["date"] for d in first], [d["date"] for d in second])
+        self.assertEqual(first[0], second[0])
+        # Rows carry short idle time too, so the popup can read them as stored
+        stored = DailyTotalsRepository.find_day(start)
+        assert stored is not None
+        self.assertEqual((stored[0], stored[2]), (0.0, 0.0))
+
+
+
+class TestDayPeriodCache(unittest.TestCase):
+    """Test that day periods are folded from an incrementally updated cache."""
+
+    def setUp(self) -> None:
+        """Point the connection layer at a fresh database."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path_patcher = patch.object(
+            connection, 'DB_PATH', os.path.join(self.tmpdir.name, "test.db")
+        )
+        self.path_patcher.start()
+        connection.ensure_db_exists()
+        ActivityService.clear_cache()
+        self.service = ActivityService()
+        self.day = datetime.date.today() - datetime.timedelta(days=2)
+        self.noon = datetime.datetime.combine(self.day, datetime.time(12))
+
+    def tearDown(self) -> None:
+        connection.close_connection()
+        self.path_patcher.stop()
+        self.tmpdir.cleanup()
+
+    def _insert(self, offset_minutes: int, type_: str) -> None:
+        EventRepository.insert(
+            type_, timestamp=self.noon + datetime.timedelta(minutes=offset_minutes)
+        )
+
+    def test_only_new_events_are_fetched(self) -> None:
+        """A second call reads events after the cached id, including backdated ones."""
+        self._insert(0, "screen_on")
+        self._insert(60, "screen_off")
+        first = self.service.get_activity_periods_for_day(self.day)
+        self.assertEqual([p["state"] for p in first], ["inactive", "active", "inactive"])
+
+        # A backdated idle_start lands inside the cached active period
+        self._insert(30, "idle_start")
+        with patch.object(self.service.repo, 'find_rows_since',
+                          wraps=self.service.repo.find_rows_since) as since:
+            second = self.service.get_activity_periods_for_day(self.day)
+
+        self.assertEqual(since.call_args[0][2], 2)
+        self.assertEqual([p["state"] for p in second], ["inactive", "active", "inactive"])
+        self.assertEqual(second[1]["duration_seconds"], 1800.0)
+
+    def test_range_warms_cache_with_one_query(self) -> None:
+        """A cold multi-day range loads all its days in a single scan."""
+        self._insert(0, "screen_on")
+        self._insert(60, "screen_off")
+        self._insert(24 * 60, "screen_on")
+        self._insert(24 * 60 + 30, "idle_start")
+        start = self.day - datetime.timedelta(days=2)
+        end = self.day + datetime.timedelta(days=1)
+
+        with patch.object(self.service.repo, 'find_rows_since',
+                          wraps=self.service.repo.find_rows_since) as since:
+            totals = self.service.get_daily_totals_range(start, end)
+
+        # One bulk load; the warmed days are folded without a top-up query
+        self.assertEqual(since.call_args_list[0][0][2], 0)
+        self.assertEqual(since.call_count, 1)
+        active = {t["date"]: t["active_seconds"] for t in totals}
+        self.assertEqual(active[self.day.isoformat()], 3600.0)
+        self.assertEqual(active[(self.day + datetime.timedelta(days=1)).isoformat()], 1800.0)
+
+    def test_last_24h_cut_from_cached_days(self) -> None:
+        """The rolling window reuses day caches and ignores older events."""
+        now = datetime.datetime.now().replace(microsecond=0)
+        for hours_ago, type_ in ((30, "screen_on"), (2, "screen_on"), (1, "idle_start")):
+            EventRepository.insert(type_, timestamp=now - datetime.timedelta(hours=hours_ago))
+
+        periods = self.service.get_activity_periods_last_24h()
+
+        self.assertEqual([p["state"] for p in periods], ["inactive", "active", "inactive"])
+        self.assertEqual(periods[1]["duration_seconds"], 3600.0)
+        cached = self.service._day_cache # pyright: ignore[reportPrivateUsage]
+        self.assertIn(now.date(), cached)
+
+    def test_totals_match_folded_periods(self) -> None:
+        """Summed totals equal the durations of the periods built for the day."""
+        self._insert(0, "screen_on")
+        self._insert(45, "idle_start")
+        self._insert(50, "idle_end")
+        self._insert(90, "screen_off")
+
+        periods = self.service.get_activity_periods_for_day(self.day)
+        totals = self.service._sum_state_seconds( # pyright: ignore[reportPrivateUsage]
+            *self.service._day_state_changes(self.day) # pyright: ignore[reportPrivateUsage]
+        )
+
+        self.assertEqual(totals, (
+            sum(p["duration_seconds"] for p in periods if p["state"] == "active"),
+            sum(p["duration_seconds"] for p in periods if p["state"] == "inactive"),
+            5 * 60.0,  # the idle_start..idle_end pause
+        ))
+        self.assertEqual(totals[0], 85 * 60.0)
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,71 @@
+"""Unit tests for the app tracker's switch detection."""
+import unittest
+from unittest.mock import patch
+import datetime
+from screentray.plugins.app_tracker import tracker as app_tracker
+
+
+class TestAppTracker(unittest.TestCase):
+    """Test that app switches are debounced before being recorded."""
+
+    def setUp(self) -> None:
+        self.window_patcher = patch.object(app_tracker, 'get_active_window_info')
+        self.insert_patcher = patch('screentray.plugins.app_tracker.db.insert_app_events')
+        self.now_patcher = patch.object(app_tracker, 'datetime')
+        self.mock_window = self.window_patcher.start()
+        self.mock_insert = self.insert_patcher.start()
+        mock_datetime = self.now_patcher.start()
+
+        # Controlled clock advanced by _poll()
+        self.clock = datetime.datetime(2025, 1, 1, 12, 0, 0)
+        mock_datetime.datetime.now.side_effect = lambda: self.clock
+
+        self.tracker = app_tracker.AppTracker()
+        self.tracker.is_tracking = True
+
+    def tearDown(self) -> None:
+        self.window_patcher.stop()
+        self.insert_patcher.stop()
+        self.now_patcher.stop()
+
+    def _poll(self, app_name: str, after_seconds: int = 2) -> None:
+        self.clock += datetime.timedelta(seconds=after_seconds)
+        self.mock_window.return_value = (app_name, f"{app_name} window")
+        self.tracker.poll()
+
+    def test_first_app_recorded_immediately(self) -> None:
+        """The initial app needs no dwell time."""
+        self._poll("Editor")
+
+        self.mock_insert.assert_called_once()
+        self.assertEqual(self.tracker.current_app, "Editor")
+
+    def test_brief_focus_flash_is_ignored(self) -> None:
+        """Switching away and back within the dwell window records nothing."""
+        self._poll("Editor")
+        self.mock_insert.reset_mock()
+
+        self._poll("Popup")
+        self._poll("Editor")
+
+        self.mock_insert.assert_not_called()
+        self.assertEqual(self.tracker.current_app, "Editor")
+
+    def test_settled_switch_recorded_at_focus_time(self) -> None:
+        """A switch held past the dwell window is recorded from when it started."""
+        self._poll("Editor")
+        self.mock_insert.reset_mock()
+
+        self._poll("Browser")
+        focus_time = self.clock
+        self._poll("Browser", after_seconds=app_tracker.SWITCH_MIN_DURATION)
+
+        self.mock_insert.assert_called_once_with(
+            [("Editor", "switch_from", None), ("Browser", "switch_to", "Browser window")],
+            focus_time
+        )
+        self.assertEqual(self.tracker.current_app, "Browser")
+
+
+if __name__ == "__main__":
+    unittest.main()
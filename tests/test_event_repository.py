@@ -0,0 +1,129 @@
+"""Unit tests for EventRepository queries against a temporary database."""
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+import datetime
+from typing import Any
+from screentray.db import connection
+from screentray.db import event_repository
+from screentray.db.event_repository import EventRepository
+
+
+class TestEventRepository(unittest.TestCase):
+    """Test repository SQL on a throwaway database file."""
+
+    def setUp(self) -> None:
+        """Point the connection layer at a fresh database."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path_patcher = patch.object(
+            connection, 'DB_PATH', os.path.join(self.tmpdir.name, "test.db")
+        )
+        self.path_patcher.start()
+        connection.ensure_db_exists()
+        self.base_time = datetime.datetime(2025, 1, 1, 12, 0, 0)
+
+    def tearDown(self) -> None:
+        connection.close_connection()
+        self.path_patcher.stop()
+        self.tmpdir.cleanup()
+
+    def test_queued_inserts_are_written_on_flush(self) -> None:
+        """insert_async rows land in the table once flush() returns."""
+        EventRepository.insert_async("idle_start", "idle 100s", timestamp=self.base_time)
+        EventRepository.insert_async("idle_end", timestamp=self.base_time + datetime.timedelta(minutes=5))
+        EventRepository.flush()
+
+        events = EventRepository.find_events_in_period(
+            self.base_time, self.base_time + datetime.timedelta(hours=1)
+        )
+
+        self.assertEqual([(e.type, e.detail) for e in events],
+                         [("idle_start", "idle 100s"), ("idle_end", "")])
+
+    def test_failed_batch_is_retried(self) -> None:
+        """A batch that fails to commit is written by a later attempt."""
+        real_cursor = event_repository.get_cursor
+        calls: list[int] = []
+
+        def flaky_cursor() -> Any:
+            calls.append(1)
+            if len(calls) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            return real_cursor()
+
+        with patch.object(event_repository, 'get_cursor', flaky_cursor):
+            EventRepository.insert_async("poll", "first", timestamp=self.base_time)
+            EventRepository.flush()
+            EventRepository.insert_async("poll", "second",
+                                         timestamp=self.base_time + datetime.timedelta(minutes=1))
+            EventRepository.flush()
+
+        events = EventRepository.find_events_in_period(
+            self.base_time, self.base_time + datetime.timedelta(hours=1)
+        )
+
+        self.assertEqual([e.detail for e in events], ["first", "second"])
+
+    def test_failed_batch_is_retried_without_new_events(self) -> None:
+        """A failed batch is retried after the flush interval even if nothing else is queued."""
+        real_cursor = event_repository.get_cursor
+        calls: list[int] = []
+
+        def flaky_cursor() -> Any:
+            calls.append(1)
+            if len(calls) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            return real_cursor()
+
+        with patch.object(event_repository, 'get_cursor', flaky_cursor), \
+                patch.object(event_repository, 'WRITE_FLUSH_INTERVAL', 0.01):
+            EventRepository.insert_async("poll", "only", timestamp=self.base_time)
+            deadline = time.monotonic() + 2.0
+            while len(calls) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(len(calls), 2)
+            EventRepository.flush()
+
+        events = EventRepository.find_events_in_period(
+            self.base_time, self.base_time + datetime.timedelta(hours=1)
+        )
+
+        self.assertEqual([e.detail for e in events], ["only"])
+
+    def test_flush_drops_rows_that_keep_failing(self) -> None:
+        """flush() retries once, then drops the rows instead of leaving them queued."""
+        def broken_cursor() -> Any:
+            raise sqlite3.OperationalError("database is locked")
+
+        with patch.object(event_repository, 'get_cursor', broken_cursor), \
+                patch.object(event_repository, 'MAX_PENDING_WRITES', 2):
+            for minute in range(3):
+                EventRepository.insert_async("poll", str(minute),
+                                             timestamp=self.base_time + datetime.timedelta(minutes=minute))
+            EventRepository.flush()
+
+        events = EventRepository.find_events_in_period(
+            self.base_time, self.base_time + datetime.timedelta(hours=1)
+        )
+
+        self.assertEqual(events, [])
+        self.assertEqual(event_repository._pending, [])
+
+    def test_schema_is_stamped_and_not_rebuilt(self) -> None:
+        """A stamped database skips the DDL on later startups."""
+        conn = connection.get_connection()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        self.assertEqual(version, connection.SCHEMA_VERSION)
+
+        statements: list[str] = []
+        conn.set_trace_callback(statements.append)
+        connection.ensure_db_exists()
+        conn.set_trace_callback(None)
+
+        self.assertEqual(statements, ["PRAGMA user_version"])
+
+if __name__ == "__main__":
+    unittest.main()
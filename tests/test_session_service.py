@@ -15,12 +15,12 @@ class TestSessionService(unittest.TestCase):
         self.base_time = datetime.datetime(2025, 1, 1, 12, 0, 0)
 
     def _mock_periods(self, periods: list[dict[str, object]]) -> None:
-        """Mock ActivityService to return test periods with ISO timestamps."""
+        """Mock ActivityService to return test periods with datetime start/end."""
         formatted_periods: list[dict[str, Any]] = []
         for p in periods:
             formatted: dict[str, Any] = {
-                "start": p["start"].isoformat() if isinstance(p["start"], datetime.datetime) else p["start"],
-                "end": p["end"].isoformat() if isinstance(p["end"], datetime.datetime) else p["end"],
+                "start": p["start"],
+                "end": p["end"],
                 "state": p["state"],
                 "duration_sec": p["duration"]
             }
@@ -29,6 +29,8 @@ class TestSessionService(unittest.TestCase):
         self.service.activity_service.get_detailed_activity_periods = Mock(
             return_value=formatted_periods
         )
+        # New periods stand for new data; drop results cached for this tick
+        SessionService.clear_cache()
 
     def test_no_session_when_inactive(self) -> None:
         """Inactive state = no current session."""
@@ -93,6 +95,46 @@ class TestSessionService(unittest.TestCase):
 
         self.assertFalse(self.service.is_currently_active())
 
+    def test_session_and_break_use_one_period_scan(self) -> None:
+        """Combined lookup matches the individual calls and loads periods once."""
+        break_start = self.base_time + datetime.timedelta(minutes=10)
+        break_end = break_start + datetime.timedelta(minutes=5)
+        self._mock_periods([
+            {"start": self.base_time, "end": break_start,
+             "state": "active", "duration": 600.0},
+            {"start": break_start, "end": break_end,
+             "state": "inactive", "duration": 300.0},
+            {"start": break_end, "end": break_end + datetime.timedelta(minutes=5),
+             "state": "active", "duration": 300.0}
+        ])
+
+        (session_start, session_s), (b_start, b_end, b_s) = \
+            self.service.get_session_and_break()
+
+        self.assertEqual(session_start, break_end)
+        self.assertEqual(session_s, 300.0)
+        self.assertEqual((b_start, b_end, b_s), (break_start, break_end, 300.0))
+        self.service.activity_service.get_detailed_activity_periods.assert_called_once_with(
+            hours=24, iso=False, include_events=False
+        )
+
+
+    def test_results_shared_within_a_tick(self) -> None:
+        """Repeated lookups in one tick reuse the scan until a new event arrives."""
+        self._mock_periods([
+            {"start": self.base_time, "end": self.base_time + datetime.timedelta(minutes=5),
+             "state": "active", "duration": 300.0}
+        ])
+        self.service.repo.get_latest_id = Mock(return_value=7)  # type: ignore[method-assign]
+        scan = self.service.activity_service.get_detailed_activity_periods
+
+        self.service.get_current_session()
+        self.service.get_last_break()
+        self.assertEqual(scan.call_count, 1)
+
+        self.service.repo.get_latest_id.return_value = 8
+        self.service.is_currently_active()
+        self.assertEqual(scan.call_count, 2)
 
 if __name__ == "__main__":
     unittest.main()
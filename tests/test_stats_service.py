@@ -0,0 +1,69 @@
+"""Unit tests for StatsService."""
+import unittest
+from unittest.mock import Mock
+import datetime
+from screentray.services.stats_service import StatsService
+
+
+class TestStatsService(unittest.TestCase):
+    """Test daily totals and their caching."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.service = StatsService()
+        self.service.activity_service.get_activity_periods_for_day = Mock(return_value=[
+            {"state": "active", "duration_seconds": 600.0},
+            {"state": "inactive", "duration_seconds": 30.0},
+            {"state": "inactive", "duration_seconds": 900.0},
+        ])
+        self.service.repo.get_latest_id = Mock(return_value=42)
+        self.service.daily_repo = Mock()
+        self.service.daily_repo.find_day.return_value = None
+        self.yesterday = (datetime.date.today() - datetime.timedelta(days=1)).isoformat()
+
+    def test_short_inactive_counts_as_active(self) -> None:
+        """Inactive periods under the idle threshold count as active."""
+        totals = self.service.get_daily_totals("2025-01-01")
+
+        self.assertEqual(totals, {"active": 630.0, "inactive": 900.0})
+
+    def test_yesterday_cached_until_new_events(self) -> None:
+        """Yesterday is recomputed only when the latest event id moves."""
+        periods_mock = self.service.activity_service.get_activity_periods_for_day
+
+        self.service.get_daily_totals(self.yesterday)
+        self.service.get_daily_totals(self.yesterday)
+        self.assertEqual(periods_mock.call_count, 1)
+
+        self.service.repo.get_latest_id.return_value = 43
+        self.service.get_daily_totals(self.yesterday)
+        self.assertEqual(periods_mock.call_count, 2)
+
+    def test_settled_day_read_from_rollup(self) -> None:
+        """Older days are computed once, stored, then served from the rollup."""
+        periods_mock = self.service.activity_service.get_activity_periods_for_day
+        daily_repo = self.service.daily_repo
+
+        totals = self.service.get_daily_totals("2025-01-01")
+        daily_repo.save_day.assert_called_once_with(
+            datetime.date(2025, 1, 1), 600.0, 930.0, 30.0
+        )
+
+        daily_repo.find_day.return_value = (600.0, 930.0, 30.0)
+        self.service.repo.get_latest_id.return_value = 43
+        self.assertEqual(self.service.get_daily_totals("2025-01-01"), totals)
+        self.assertEqual(periods_mock.call_count, 1)
+
+    def test_today_not_cached(self) -> None:
+        """Today's totals are always recomputed."""
+        periods_mock = self.service.activity_service.get_activity_periods_for_day
+        today = datetime.date.today().isoformat()
+
+        self.service.get_daily_totals(today)
+        self.service.get_daily_totals(today)
+
+        self.assertEqual(periods_mock.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,9 +13,11 @@ class TestTrackerService(unittest.TestCase):
         self.mock_plugin_patcher = patch.object(tracker_main, 'PluginManager')
         self.mock_platform_patcher = patch.object(tracker_main, 'platform')
         self.mock_ensure_db_patcher = patch.object(tracker_main, 'ensure_db_exists')
-
-        # Patch time.sleep specifically in the main module's namespace
-        self.mock_sleep_patcher = patch('screentray.tracker.main.time.sleep')
+        # Route the combined probe through the module functions tests patch
+        self.mock_probe_patcher = patch.object(
+            tracker_main, 'get_idle_and_screen_state',
+            side_effect=lambda: (tracker_main.get_idle_seconds(), tracker_main.is_screen_on())
+        )
 
         # Patch constants
         self.mock_threshold_patcher = patch.object(tracker_main, 'IDLE_THRESHOLD_SEC', 60.0)
@@ -26,12 +28,15 @@ class TestTrackerService(unittest.TestCase):
         self.mock_plugin_cls = self.mock_plugin_patcher.start()
         self.mock_platform = self.mock_platform_patcher.start()
         self.mock_ensure_db = self.mock_ensure_db_patcher.start()
-        self.mock_sleep = self.mock_sleep_patcher.start()
+        self.mock_probe_patcher.start()
         self.mock_threshold_patcher.start()
         self.mock_log_interval_patcher.start()
 
         self.repo_instance = self.mock_repo_cls.return_value
+        # Queued and direct inserts are asserted together
+        self.repo_instance.insert_async = self.repo_instance.insert
         self.plugin_instance = self.mock_plugin_cls.return_value
+        self.plugin_instance.poll_hooks = []
 
         # Configure default return values for the platform mock.
         # Otherwise, they return MagicMocks which cause TypeErrors when compared to floats/bools.
@@ -39,12 +44,15 @@ class TestTrackerService(unittest.TestCase):
         self.mock_platform.is_screen_on.return_value = True
         self.mock_platform.get_active_window_info.return_value = ("TestApp", "TestWindow")
 
+        # The loop waits between polls via the platform; tests drive it with side effects
+        self.mock_sleep = self.mock_platform.wait_for_activity
+
     def tearDown(self) -> None:
         self.mock_repo_patcher.stop()
         self.mock_plugin_patcher.stop()
         self.mock_platform_patcher.stop()
-        self.mock_sleep_patcher.stop()
         self.mock_ensure_db_patcher.stop()
+        self.mock_probe_patcher.stop()
         self.mock_threshold_patcher.stop()
         self.mock_log_interval_patcher.stop()
 
@@ -60,14 +68,36 @@ class TestTrackerService(unittest.TestCase):
         self.mock_ensure_db.assert_called_once()
         self.mock_plugin_cls.assert_called()
         self.plugin_instance.discover_plugins.assert_called()
-        self.plugin_instance.start_all.assert_called()
+        self.plugin_instance.initialize.assert_called_once()
 
         # Verify Startup Event
-        self.repo_instance.insert.assert_any_call("tracker_start")
+        self.repo_instance.insert.assert_any_call("tracker_start", timestamp=ANY)
+
+        # Verify the loop waits for the configured interval via the platform
+        self.mock_sleep.assert_called_with(0.1)
 
         # Verify Shutdown
         self.plugin_instance.stop_all.assert_called()
-        self.repo_instance.insert.assert_any_call("tracker_stop")
+        self.repo_instance.flush.assert_called_once()
+        self.repo_instance.insert.assert_any_call("tracker_stop", timestamp=ANY)
+
+    @patch('screentray.tracker.main.on_io_error')
+    def test_lost_x_connection_records_stop(self, mock_on_io_error: MagicMock) -> None:
+        """The X IO error callback flushes and stamps tracker_stop before Xlib exits."""
+        def lose_connection(interval: float) -> None:
+            callback = mock_on_io_error.call_args_list[0][0][0]
+            callback()
+            raise SystemExit  # Xlib exits the process after the handler returns
+
+        self.mock_sleep.side_effect = lose_connection
+
+        # Run
+        with self.assertRaises(SystemExit):
+            tracker_main.main()
+
+        self.repo_instance.flush.assert_called_once()
+        self.repo_instance.insert.assert_any_call("tracker_stop", timestamp=ANY)
+        self.plugin_instance.stop_all.assert_not_called()
 
     @patch('screentray.tracker.main.get_idle_seconds')
     @patch('screentray.tracker.main.is_screen_on')
@@ -101,7 +131,7 @@ class TestTrackerService(unittest.TestCase):
 
         # 1. Initial State Establishment
         # Should insert 'poll' with initial state
-        self.repo_instance.insert.assert_any_call("poll", ANY)
+        self.repo_instance.insert.assert_any_call("poll", ANY, timestamp=ANY)
         self.plugin_instance.notify_active.assert_any_call()
 
         # 2. Active -> Inactive (Idle)
@@ -138,40 +168,103 @@ class TestTrackerService(unittest.TestCase):
         tracker_main.main()
 
         # Verify screen_off event
-        self.repo_instance.insert.assert_any_call("screen_off")
+        self.repo_instance.insert.assert_any_call("screen_off", timestamp=ANY)
         self.plugin_instance.notify_inactive.assert_called()
 
-    @patch('screentray.tracker.main.datetime')
     @patch('screentray.tracker.main.get_idle_seconds')
     @patch('screentray.tracker.main.is_screen_on')
-    def test_periodic_poll_logging(self, mock_is_screen_on: MagicMock, mock_get_idle: MagicMock, mock_dt: MagicMock) -> None:
+    def test_inactive_polling_backs_off(self, mock_is_screen_on: MagicMock, mock_get_idle: MagicMock) -> None:
+        """Polling slows down while the screen is off and resets once activity returns."""
+        # Screen off for three polls, then active with a plugin that polls
+        mock_get_idle.return_value = 5.0
+        mock_is_screen_on.side_effect = [False, False, False, True]
+        self.plugin_instance.poll_hooks = [MagicMock()]
+
+        self.mock_sleep.side_effect = [None, None, None, KeyboardInterrupt]
+
+        # Run
+        tracker_main.main()
+
+        intervals = [c[0][0] for c in self.mock_sleep.call_args_list]
+        self.assertEqual(intervals, [0.1, 0.2, 0.4, 0.1])
+
+    @patch('screentray.tracker.main.get_idle_seconds')
+    @patch('screentray.tracker.main.is_screen_on')
+    def test_idle_with_screen_on_keeps_base_rate(self, mock_is_screen_on: MagicMock, mock_get_idle: MagicMock) -> None:
+        """Input wakes nothing, so an idle but lit screen is polled at the base rate."""
+        mock_get_idle.return_value = 100.0
+        mock_is_screen_on.return_value = True
+
+        self.mock_sleep.side_effect = [None, None, None, KeyboardInterrupt]
+
+        # Run
+        tracker_main.main()
+
+        intervals = [c[0][0] for c in self.mock_sleep.call_args_list]
+        self.assertEqual(intervals, [0.1, 0.1, 0.1, 0.1])
+
+    @patch('screentray.tracker.main.get_idle_seconds')
+    @patch('screentray.tracker.main.is_screen_on')
+    def test_unchanged_inactive_polls_do_no_work(self, mock_is_screen_on: MagicMock, mock_get_idle: MagicMock) -> None:
+        """Once inactive, repeat polls skip the clock, the database and plugins."""
+        mock_get_idle.return_value = 100.0
+        mock_is_screen_on.return_value = False
+        self.mock_sleep.side_effect = [None, None, None, KeyboardInterrupt]
+
+        with patch.object(tracker_main.datetime, 'datetime', wraps=datetime.datetime) as mock_dt:
+            tracker_main.main()
+
+        # tracker_start, initial state and tracker_stop only
+        self.assertEqual(mock_dt.now.call_count, 3)
+        self.assertEqual(self.repo_instance.insert.call_count, 2)
+        self.plugin_instance.notify_inactive.assert_not_called()
+
+    @patch('screentray.tracker.main.get_idle_seconds')
+    @patch('screentray.tracker.main.is_screen_on')
+    def test_active_polls_at_base_rate_for_screen_off(self, mock_is_screen_on: MagicMock, mock_get_idle: MagicMock) -> None:
+        """DPMS power-off sends no event, so active polling never outwaits LOG_INTERVAL."""
+        # Active with no polling plugins, then the screen is powered off
+        mock_get_idle.return_value = 10.0
+        mock_is_screen_on.side_effect = [True, True, False]
+
+        self.mock_sleep.side_effect = [None, None, KeyboardInterrupt]
+
+        # Run
+        tracker_main.main()
+
+        intervals = [c[0][0] for c in self.mock_sleep.call_args_list]
+        self.assertEqual(intervals, [0.1, 0.1, 0.1])
+        self.repo_instance.insert.assert_any_call("screen_off", timestamp=ANY)
+
+    @patch('screentray.tracker.main.monotonic')
+    @patch('screentray.tracker.main.get_idle_seconds')
+    @patch('screentray.tracker.main.is_screen_on')
+    def test_periodic_poll_logging(self, mock_is_screen_on: MagicMock, mock_get_idle: MagicMock, mock_clock: MagicMock) -> None:
         """Test that a 'poll' event is inserted every 60 seconds."""
         mock_get_idle.return_value = 10.0
         mock_is_screen_on.return_value = True
 
-        # Mock time flow: Start, Loop 1 (Init), Loop 2 (No Poll), Loop 3 (+61s, Poll triggers)
-        base_time = datetime.datetime(2025, 1, 1, 12, 0, 0)
-        mock_dt.datetime.now.side_effect = [
-            base_time, # Startup logging
-            base_time, # Init loop start
-            base_time, # Init log
-            base_time + datetime.timedelta(seconds=10), # Loop 2 start (Diff < 60)
-            base_time + datetime.timedelta(seconds=70), # Loop 3 start (Diff > 60)
-            base_time + datetime.timedelta(seconds=70), # Loop 3 poll log
-            base_time + datetime.timedelta(seconds=70), # Loop 3 end
-            base_time + datetime.timedelta(seconds=70), # Stop log
+        # Mock monotonic time flow: Startup, Loop 1 (Init), Loop 2 (+60s, Poll triggers), Loop 3
+        mock_clock.side_effect = [
+            0.0,   # Startup
+            10.0,  # Loop 1 start (initial poll)
+            70.0,  # Loop 2 start (Diff >= 60)
+            75.0,  # Loop 3 start (Diff < 60)
         ]
 
         self.mock_sleep.side_effect = [None, None, KeyboardInterrupt]
+        plugin_poll = MagicMock()
+        self.plugin_instance.poll_hooks = [plugin_poll]
 
         # Run
         tracker_main.main()
 
-        # Verify 'poll' was called for the periodic update
+        # Verify 'poll' was logged at startup and once for the periodic update
         poll_calls = [c for c in self.repo_instance.insert.call_args_list if c[0][0] == 'poll']
-        self.assertGreaterEqual(len(poll_calls), 2)
+        self.assertEqual(len(poll_calls), 2)
 
-        self.plugin_instance.plugins.values.assert_called()
+        # Plugins are polled on every active iteration after the initial one
+        self.assertEqual(plugin_poll.call_count, 2)
 
 
 if __name__ == "__main__":
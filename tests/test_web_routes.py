@@ -0,0 +1,77 @@
+"""Unit tests for the web plugin's core API routes."""
+import datetime
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from screentray.db import connection
+from screentray.db.event_repository import EventRepository
+from screentray.services.activity_service import ActivityService
+
+try:
+    from flask import Flask
+    from screentray.plugins.web.routes import core_routes
+except ImportError:  # Web plugin dependency not installed
+    Flask = None  # type: ignore[assignment, misc]
+
+
+@unittest.skipIf(Flask is None, "flask is not installed")
+class TestCoreRoutes(unittest.TestCase):
+    """Test core routes against a throwaway database file."""
+
+    def setUp(self) -> None:
+        """Point the connection layer at a fresh database and build the app."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path_patcher = patch.object(
+            connection, 'DB_PATH', os.path.join(self.tmpdir.name, "test.db")
+        )
+        self.path_patcher.start()
+        connection.ensure_db_exists()
+        ActivityService.clear_cache()
+        EventRepository.insert("screen_on")
+
+        app = Flask(__name__)
+        core_routes.register_routes(app)
+        self.client = app.test_client()
+
+    def tearDown(self) -> None:
+        connection.close_connection()
+        self.path_patcher.stop()
+        self.tmpdir.cleanup()
+
+    def test_requests_share_one_connection(self) -> None:
+        """Requests on the server thread reuse a single read connection."""
+        with patch.object(connection.sqlite3, 'connect', wraps=sqlite3.connect) as connect:
+            self.assertEqual(self.client.get("/api/events").status_code, 200)
+            self.assertEqual(self.client.get("/api/periods").status_code, 200)
+            self.assertEqual(self.client.get("/api/events").status_code, 200)
+
+        self.assertEqual(connect.call_count, 1)
+
+    def test_events_cursor_pages_through_results(self) -> None:
+        """before_ts/before_id from the last row fetch the next page."""
+        base = datetime.datetime(2025, 1, 1, 12, 0, 0)
+        for minute in range(3):
+            EventRepository.insert("poll", str(minute), timestamp=base + datetime.timedelta(minutes=minute))
+
+        first = self.client.get("/api/events?limit=2&q=poll").get_json()
+        last = first[-1]
+        second = self.client.get(
+            f"/api/events?limit=2&q=poll&before_ts={last['timestamp']}&before_id={last['id']}"
+        ).get_json()
+
+        self.assertEqual([e["detail"] for e in first + second], ["2", "1", "0"])
+
+    def test_events_rejects_bad_cursor(self) -> None:
+        """A partial or non-integer cursor is a 400, not a server error."""
+        for query in ("before_ts=2025-01-01T12:00:00",
+                      "before_id=5",
+                      "before_ts=2025-01-01T12:00:00&before_id=abc"):
+            resp = self.client.get(f"/api/events?{query}")
+            self.assertEqual(resp.status_code, 400, query)
+            self.assertIn("error", resp.get_json())
+
+
+if __name__ == "__main__":
+    unittest.main()
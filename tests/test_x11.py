@@ -0,0 +1,51 @@
+"""Unit tests for the ctypes X11 connection wrapper."""
+import socket
+import unittest
+from unittest.mock import MagicMock, patch
+from screentray.platform import x11
+from screentray.platform.x11 import X11Display
+
+
+class TestWaitForEvent(unittest.TestCase):
+    """Test wait_for_event against stubbed Xlib entry points."""
+
+    def setUp(self) -> None:
+        """Build a display around a socket pair instead of an X connection."""
+        self.server, self.client = socket.socketpair()
+        self.display = X11Display.__new__(X11Display)
+        self.display.display = 1
+        self.display.root = 1
+        self.display._xlib = MagicMock()
+        self.display._xss = MagicMock()
+        self.display._fd = self.client.fileno()
+        self.display._event = x11.XEvent()
+        self.display._notify_selected = True
+
+    def tearDown(self) -> None:
+        self.server.close()
+        self.client.close()
+
+    @patch('screentray.platform.x11.monotonic')
+    def test_readable_without_event_keeps_waiting(self, mock_clock: MagicMock) -> None:
+        """A readable socket with nothing pending does not end the wait early."""
+        # Readable on every select; XPending only sees an event on the third check
+        self.server.send(b"x")
+        self.display._xlib.XPending.side_effect = [0, 0, 1, 1, 0]
+        mock_clock.side_effect = [0.0, 1.0, 2.0]
+
+        self.assertTrue(self.display.wait_for_event(5.0))
+        self.display._xlib.XNextEvent.assert_called_once()
+
+    @patch('screentray.platform.x11.monotonic')
+    def test_readable_without_event_times_out(self, mock_clock: MagicMock) -> None:
+        """With no event before the deadline the wait reports a timeout."""
+        self.server.send(b"x")
+        self.display._xlib.XPending.return_value = 0
+        mock_clock.side_effect = [0.0, 1.0, 3.0, 5.0]
+
+        self.assertFalse(self.display.wait_for_event(5.0))
+        self.display._xlib.XNextEvent.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()